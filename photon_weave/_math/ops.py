@@ -1,22 +1,31 @@
-from typing import List, Union
+from functools import lru_cache, partial
+from typing import Callable, Dict, Hashable, List, Optional, Tuple, TypeVar, Union
 
 import jax
 import jax.numpy as jnp
 import numpy as np
 from jax import jit
-from jax.scipy.linalg import expm
+from opt_einsum import contract_path, get_symbol
+
+from photon_weave.photon_weave import Config
 
 jax.config.update("jax_enable_x64", True)
 
+T = TypeVar("T")
+
 
-def identity_operator() -> jax.Array:
+@lru_cache(maxsize=128)
+def identity_operator(dimensions: int = 2) -> jax.Array:
     """
-    identity_operator _summary_
+    identity_operator _summary_, cached per dimensions, jax arrays are
+    immutable so the same instance can be shared between callers
 
+    :param dimensions: Dimensions of the operator, 2 (polarization) by default
+    :type dimensions: int
     :return: _description_
     :rtype: jax.Array
     """
-    return jnp.eye(N=2)
+    return jnp.eye(N=dimensions)
 
 
 def hadamard_operator() -> jax.Array:
@@ -208,51 +217,116 @@ def u3_operator(phi: float, theta: float, omega: float) -> jax.Array:
     )
 
 
-def annihilation_operator(cutoff: int) -> jnp.ndarray:
+def _operator_dtype(dtype: Optional[jnp.dtype]) -> jnp.dtype:
+    """
+    Resolves the dtype of the constructed operators, falling back to the
+    dtype configured in `Config`
+    """
+    if dtype is None:
+        return jnp.dtype(Config().dtype)
+    return jnp.dtype(dtype)
+
+
+def annihilation_operator(
+    cutoff: int, dtype: Optional[jnp.dtype] = None
+) -> jnp.ndarray:
     """
     annihilation_operator _summary_
 
     :param cutoff: _description_
     :type cutoff: int
+    :param dtype: Complex dtype of the operator, `Config().dtype` by default
+    :type dtype: Optional[jnp.dtype]
     :return: _description_
     :rtype: jnp.ndarray
     """
-    return jnp.diag(jnp.sqrt(jnp.arange(1, cutoff, dtype=np.complex128)), 1)
+    return _annihilation_operator(int(cutoff), _operator_dtype(dtype))
 
 
-def creation_operator(cutoff: int) -> jnp.ndarray:
+@lru_cache(maxsize=128)
+def _annihilation_operator(cutoff: int, dtype: jnp.dtype) -> jnp.ndarray:
+    """
+    Cached annihilation operator, jax arrays are immutable so the
+    same instance can safely be shared between callers
+    """
+    return _ladder_operator(cutoff, 1, dtype)
+
+
+def creation_operator(cutoff: int, dtype: Optional[jnp.dtype] = None) -> jnp.ndarray:
     """
     creation_operator _summary_
 
     :param cutoff: _description_
     :type cutoff: int
+    :param dtype: Complex dtype of the operator, `Config().dtype` by default
+    :type dtype: Optional[jnp.dtype]
     :return: _description_
     :rtype: jnp.ndarray
     """
-    return jnp.conjugate(annihilation_operator(cutoff=cutoff)).T
+    return _creation_operator(int(cutoff), _operator_dtype(dtype))
 
 
-def number_operator(cutoff: int) -> jnp.ndarray:
+@lru_cache(maxsize=128)
+def _creation_operator(cutoff: int, dtype: jnp.dtype) -> jnp.ndarray:
+    """
+    Cached creation operator
+    """
+    return _ladder_operator(cutoff, -1, dtype)
+
+
+@partial(jit, static_argnums=(0, 1, 2))
+def _ladder_operator(cutoff: int, offset: int, dtype: jnp.dtype) -> jnp.ndarray:
+    r"""
+    Builds the ladder operator on the device, with :math:`\sqrt{n}` on the
+    super- (offset=1) or sub-diagonal (offset=-1)
+    """
+    sqrt_n = jnp.sqrt(jnp.arange(1, cutoff, dtype=jnp.float64))
+    return jnp.diag(sqrt_n.astype(dtype), offset)
+
+
+def number_operator(cutoff: int, dtype: Optional[jnp.dtype] = None) -> jnp.ndarray:
     """
     number_operator _summary_
 
     :param cutoff: _description_
     :type cutoff: int
+    :param dtype: Complex dtype of the operator, `Config().dtype` by default
+    :type dtype: Optional[jnp.dtype]
     :return: _description_
     :rtype: jnp.ndarray
     """
-    return jnp.matmul(creation_operator(cutoff), annihilation_operator(cutoff))
+    return jnp.matmul(
+        creation_operator(cutoff, dtype), annihilation_operator(cutoff, dtype)
+    )
 
 
-def _expm(mat: jnp.ndarray) -> jnp.ndarray:
-    """
-    Exponential Matrix
+@jit
+def _expm_antihermitian(mat: jnp.ndarray) -> jnp.ndarray:
+    r"""
+    Exponential of an anti-Hermitian matrix (:math:`A^\dagger = -A`).
+
+    Since :math:`-iA` is Hermitian, it can be diagonalized with `eigh`
+    as :math:`-iA = U \Lambda U^\dagger` and the exponential is computed
+    as :math:`e^{A} = U e^{i\Lambda} U^\dagger`, without the inverse of
+    the eigenvector matrix.
+
+    Parameters
+    ----------
+    mat: jnp.ndarray
+        Anti-Hermitian matrix
+
+    Returns
+    -------
+    jnp.ndarray
+        Unitary matrix exponential of the given matrix
     """
-    eigvals, eigvecs = jnp.linalg.eig(mat)
-    return jnp.array(eigvecs @ jnp.diag(jnp.exp(eigvals)) @ jnp.linalg.pinv(eigvecs))
+    eigvals, eigvecs = jnp.linalg.eigh(-1j * mat)
+    return (eigvecs * jnp.exp(1j * eigvals)) @ jnp.conj(eigvecs).T
 
 
-def squeezing_operator(cutoff: int, zeta: complex) -> jnp.ndarray:
+def squeezing_operator(
+    cutoff: int, zeta: complex, dtype: Optional[jnp.dtype] = None
+) -> jnp.ndarray:
     """
     squeezing_operator _summary_
 
@@ -260,16 +334,39 @@ def squeezing_operator(cutoff: int, zeta: complex) -> jnp.ndarray:
     :type cutoff: int
     :param zeta: _description_
     :type zeta: complex
+    :param dtype: Complex dtype of the operator, `Config().dtype` by default
+    :type dtype: Optional[jnp.dtype]
     :return: _description_
     :rtype: jnp.ndarray
     """
-    create = creation_operator(cutoff=cutoff)
-    destroy = annihilation_operator(cutoff=cutoff)
-    operator = 0.5 * (jnp.conj(zeta) * (destroy @ destroy) - zeta * (create @ create))
-    return expm(operator)
+    destroy_squared = _squeezing_generator(int(cutoff), _operator_dtype(dtype))
+    return _squeezing_operator(zeta, destroy_squared)
+
+
+@lru_cache(maxsize=128)
+def _squeezing_generator(cutoff: int, dtype: jnp.dtype) -> jnp.ndarray:
+    """
+    Cached generator of the squeezing operator (a^2), it only depends on
+    the cutoff, so it is reused when only zeta changes
+    """
+    destroy = _ladder_operator(cutoff, 1, dtype)
+    return destroy @ destroy
 
 
-def displacement_operator(cutoff: int, alpha: complex) -> jnp.ndarray:
+@jit
+def _squeezing_operator(zeta: complex, destroy_squared: jnp.ndarray) -> jnp.ndarray:
+    """
+    Jitted squeezing operator, given the cached generator. Since
+    a† = a^H, the a†^2 term is obtained as (a^2)^H without a second product
+    """
+    create_squared = jnp.conj(destroy_squared).T
+    operator = 0.5 * (jnp.conj(zeta) * destroy_squared - zeta * create_squared)
+    return _expm_antihermitian(operator.astype(destroy_squared.dtype))
+
+
+def displacement_operator(
+    cutoff: int, alpha: complex, dtype: Optional[jnp.dtype] = None
+) -> jnp.ndarray:
     """
     displacement_operator _summary_
 
@@ -277,16 +374,31 @@ def displacement_operator(cutoff: int, alpha: complex) -> jnp.ndarray:
     :type cutoff: int
     :param alpha: _description_
     :type alpha: complex
+    :param dtype: Complex dtype of the operator, `Config().dtype` by default
+    :type dtype: Optional[jnp.dtype]
     :return: _description_
     :rtype: jnp.ndarray
     """
-    create = creation_operator(cutoff=cutoff)
-    destroy = annihilation_operator(cutoff=cutoff)
-    operator = alpha * create - jnp.conj(alpha) * destroy
-    return expm(operator)
+    return _displacement_operator(int(cutoff), alpha, _operator_dtype(dtype))
+
+
+@partial(jit, static_argnums=(0, 2))
+def _displacement_operator(
+    cutoff: int, alpha: complex, dtype: jnp.dtype
+) -> jnp.ndarray:
+    """
+    Jitted displacement operator, compiled once per cutoff and dtype. The
+    generator is written directly onto the off-diagonals, without building
+    the creation and annihilation operators
+    """
+    sqrt_n = jnp.sqrt(jnp.arange(1, cutoff, dtype=jnp.float64))
+    operator = jnp.diag(alpha * sqrt_n, -1) - jnp.diag(jnp.conj(alpha) * sqrt_n, 1)
+    return _expm_antihermitian(operator.astype(dtype))
 
 
-def phase_operator(cutoff: int, theta: float) -> jnp.ndarray:
+def phase_operator(
+    cutoff: int, theta: float, dtype: Optional[jnp.dtype] = None
+) -> jnp.ndarray:
     r"""
     Returns a phase shift operator, given the dimensions
 
@@ -304,6 +416,8 @@ def phase_operator(cutoff: int, theta: float) -> jnp.ndarray:
         Cutoff dimensions
     theta: float
         Phase shift for the operator
+    dtype: Optional[jnp.dtype]
+        Complex dtype of the operator, `Config().dtype` by default
 
     Returns
     -------
@@ -316,24 +430,97 @@ def phase_operator(cutoff: int, theta: float) -> jnp.ndarray:
     state in the Fock basis. The diagonal matrix elements are complex exponentials that
     apply a phase proportional to the Fock state number.
     """
-    indices = jnp.arange(cutoff)
-    phases = jnp.exp(1j * indices * theta)
-    return jnp.diag(phases)
-    # return jnp.diag(jnp.array([jnp.exp(1j * n * theta) for n in range(cutoff)]))
+    if isinstance(theta, (int, float, np.integer, np.floating)):
+        return _phase_operator(int(cutoff), float(theta), _operator_dtype(dtype))
+    return _phase_operator_jit(int(cutoff), theta, _operator_dtype(dtype))
+
+
+@lru_cache(maxsize=128)
+def _phase_operator(cutoff: int, theta: float, dtype: jnp.dtype) -> jnp.ndarray:
+    """
+    Cached phase shift operator, keyed on the cutoff, the phase and the dtype.
+    Only used for concrete phases, traced phases go to the jitted builder
+    """
+    return _phase_operator_jit(cutoff, theta, dtype)
+
+
+@partial(jit, static_argnums=(0, 2))
+def _phase_operator_jit(cutoff: int, theta: float, dtype: jnp.dtype) -> jnp.ndarray:
+    """
+    Builds the phase shift operator on the device, compiled once per cutoff
+    """
+    phases = jnp.exp(1j * theta * jnp.arange(cutoff, dtype=jnp.float64))
+    return jnp.diag(phases.astype(dtype))
+
+
+def matrix_power(mat: jnp.ndarray, power: int) -> jnp.ndarray:
+    """
+    Raises a square matrix to a non-negative integer power. The power is
+    computed by repeated squaring, so only O(log(power)) matrix
+    multiplications are needed.
+
+    Parameters
+    ----------
+    mat: jnp.ndarray
+        Square matrix
+    power: int
+        Non-negative integer power
+
+    Returns
+    -------
+    jnp.ndarray
+        Matrix raised to the given power
+    """
+    if power < 0:
+        raise ValueError("Only non-negative matrix powers are supported")
+    result = None
+    base = mat
+    while power > 0:
+        if power & 1:
+            result = base if result is None else result @ base
+        power >>= 1
+        if power > 0:
+            base = base @ base
+    if result is None:
+        return jnp.eye(mat.shape[0], dtype=mat.dtype)
+    return result
 
 
 # to do: implement beamsplitter here
-@jit
+@lru_cache(maxsize=512)
+def _einsum_subscripts(indices: Tuple[Tuple[int, ...], ...]) -> str:
+    """
+    Converts integer einsum indices (indices of each operand followed
+    by the indices of the result) into a subscripts string. The symbols
+    are not limited to the ascii letters.
+    """
+    *inputs, output = ["".join(get_symbol(i) for i in idx) for idx in indices]
+    return f"{','.join(inputs)}->{output}"
+
+
+@lru_cache(maxsize=512)
+def _einsum_path(einsum_str: str, shapes: Tuple[Tuple[int, ...], ...]) -> list:
+    """
+    Computes and caches the contraction path for the given einsum string
+    and operand shapes
+    """
+    path, _ = contract_path(einsum_str, *shapes, shapes=True, optimize="greedy")
+    return path
+
+
 def compute_einsum(
-    einsum_str: str, *operands: Union[jax.Array, np.ndarray]
+    einsum: Union[str, Tuple[Tuple[int, ...], ...]],
+    *operands: Union[jax.Array, np.ndarray],
 ) -> jax.Array:
     """
-    Computes einsum using the provided einsum_str and matrices
-    with the gpu if accessible (jax.numpy).
+    Computes einsum using the provided einsum subscripts and matrices
+    with the gpu if accessible (jax.numpy). The contraction path
+    is computed once per einsum subscripts and operand shapes.
     Parameters
     ----------
-    einsum_str: str
-        Einstein Sum String
+    einsum: Union[str, Tuple[Tuple[int, ...], ...]]
+        Einstein Sum String or integer indices of each operand followed
+        by the indices of the result
     operands: Union[jax.Array, np.ndarray]
         Operands for the einstein sum
     Returns
@@ -341,13 +528,66 @@ def compute_einsum(
     jax.Array
         resulting matrix after eintein sum
     """
-    return jnp.einsum(einsum_str, *operands)
+    einsum_str = einsum if isinstance(einsum, str) else _einsum_subscripts(einsum)
+    path = _einsum_path(einsum_str, tuple(tuple(op.shape) for op in operands))
+    return jnp.einsum(einsum_str, *operands, optimize=path)
+
+
+def apply_operator_tensordot(
+    operator: Union[jax.Array, np.ndarray],
+    state: Union[jax.Array, np.ndarray],
+    axes: tuple,
+) -> jax.Array:
+    """
+    Applies the operator to a subspace of the density matrix tensor
+    with two tensor dot products (O rho O^dagger)
+
+    Parameters
+    ----------
+    operator: Union[jax.Array, np.ndarray]
+        Operator reshaped into a tensor
+    state: Union[jax.Array, np.ndarray]
+        Density matrix reshaped into a tensor
+    axes: tuple
+        Contraction axes and the final permutation, constructed by
+        `apply_operator_matrix_axes`
+
+    Returns
+    -------
+    jax.Array
+        Density matrix tensor after the operator application
+    """
+    first, second, perm = axes
+    result = jnp.tensordot(operator, state, axes=first)
+    result = jnp.tensordot(result, jnp.conj(operator), axes=second)
+    return jnp.transpose(result, perm)
+
+
+@jit
+def kron(a: jnp.ndarray, b: jnp.ndarray) -> jnp.ndarray:
+    """
+    Jitted Kronecker product, dispatched as a single fused kernel instead
+    of the separate reshape and multiply operations of `jnp.kron`
+
+    Parameters
+    ----------
+    a: jnp.ndarray
+        First (left) factor
+    b: jnp.ndarray
+        Second (right) factor
+
+    Returns
+    -------
+    jnp.ndarray
+        Kronecker product of the two arrays
+    """
+    return jnp.kron(a, b)
 
 
 @jit
 def apply_kraus(
     density_matrix: Union[np.ndarray, jnp.ndarray],
-    kraus_operators: List[Union[np.ndarray, jnp.ndarray]],
+    kraus_operators: Union[List[Union[np.ndarray, jnp.ndarray]], jnp.ndarray],
 ) -> jnp.ndarray:
     """
     Apply Kraus operators to the density matrix.
@@ -355,21 +595,259 @@ def apply_kraus(
     ----------
     density_matrix: Union[np.ndarray, jnp.ndarray]
         Density matrix onto which the Kraus operators are applied
-    kraus_operators: List[Union[np.ndarray, jnp.ndarray]]
-        List of Kraus operators to apply to the density matrix
+    kraus_operators: Union[List[Union[np.ndarray, jnp.ndarray]], jnp.ndarray]
+        List of Kraus operators or the operators stacked into an array
+        of shape (K, d, d)
     Returns
     jnp.ndarray
         density matrix after applying Kraus operators
     """
-    new_density_matrix = jnp.zeros_like(density_matrix)
-    for K in kraus_operators:
-        new_density_matrix += K @ density_matrix @ jnp.conjugate(K).T
+    # The sum over the operators is fused into the second contraction,
+    # so the K individual terms are never materialized
+    operators = jnp.asarray(kraus_operators)
+    return jnp.einsum(
+        "kij,jl,kml->im", operators, density_matrix, jnp.conjugate(operators)
+    )
+
+
+def _cached_on_operators(
+    cache: Dict[Hashable, Tuple[Tuple[Union[np.ndarray, jnp.ndarray], ...], T]],
+    size: int,
+    key: Hashable,
+    operators: List[Union[np.ndarray, jnp.ndarray]],
+    compute: Callable[[], T],
+) -> T:
+    """
+    Returns the value cached for the given operator objects, computing and
+    storing it on a miss. Entries are evicted in insertion order once the
+    cache holds `size` entries.
+
+    The operators are stored alongside the value, which keeps them alive, so
+    their ids (used in the key) cannot be reused by other arrays while the
+    entry exists. Only immutable jax arrays are cached, operators of other
+    types (e.g. numpy arrays) could be changed in place, so the value is
+    computed on every call for them.
+    """
+    if not all(isinstance(op, jax.Array) for op in operators):
+        return compute()
+    entry = cache.get(key)
+    if entry is not None and all(a is b for a, b in zip(entry[0], operators)):
+        return entry[1]
+    value = compute()
+    if len(cache) >= size:
+        cache.pop(next(iter(cache)))
+    cache[key] = (tuple(operators), value)
+    return value
+
+
+# Stacked operator arrays, keyed on the identities of the jax operators
+_STACKED_OPERATORS_CACHE: Dict[
+    Hashable, Tuple[Tuple[Union[np.ndarray, jnp.ndarray], ...], jnp.ndarray]
+] = {}
+_STACKED_OPERATORS_CACHE_SIZE = 128
+
+
+def stack_operators(
+    operators: List[Union[np.ndarray, jnp.ndarray]],
+) -> jnp.ndarray:
+    """
+    Stacks the operators into a single array with the shape (K, d, d),
+    reusing the stacked array when the same jax operator objects are stacked
+    again. Other operators (e.g. numpy arrays) can be mutated in place, so
+    they are stacked on every call
+
+    Parameters
+    ----------
+    operators: List[Union[np.ndarray, jnp.ndarray]]
+        List of the operators
+
+    Returns
+    -------
+    jnp.ndarray
+        Stacked operators
+    """
+    return _cached_on_operators(
+        _STACKED_OPERATORS_CACHE,
+        _STACKED_OPERATORS_CACHE_SIZE,
+        tuple(id(op) for op in operators),
+        operators,
+        lambda: jnp.stack([jnp.asarray(op) for op in operators]),
+    )
+
+
+@jit
+def povm_probabilities(
+    operators: jnp.ndarray, density_matrix: jnp.ndarray
+) -> jnp.ndarray:
+    r"""
+    Computes the normalized outcome probabilities
+    :math:`p_k = \mathrm{Tr}(E_k \rho)` of a POVM in a single contraction,
+    without forming the products :math:`E_k \rho`
+
+    Parameters
+    ----------
+    operators: jnp.ndarray
+        Stacked POVM operators with the shape (K, d, d)
+    density_matrix: jnp.ndarray
+        Density matrix of the measured state
+
+    Returns
+    -------
+    jnp.ndarray
+        Probabilities of the outcomes
+    """
+    probabilities = jnp.einsum("kij,ji->k", operators, density_matrix).real
+    # Normalize probabilities (handle numerical issues)
+    return probabilities / jnp.sum(probabilities)
+
+
+@jit
+def kraus_probabilities(
+    operators: jnp.ndarray, density_matrix: jnp.ndarray
+) -> jnp.ndarray:
+    r"""
+    Computes the normalized outcome probabilities
+    :math:`p_k = \mathrm{Tr}(E_k \rho E_k^\dagger)` of measurement operators
+    applied as :math:`E_k \rho E_k^\dagger`. The trace is evaluated with
+    the identity :math:`\mathrm{Tr}(AB) = \sum_{ij} A_{ij} B_{ji}`, so the
+    post measurement states are never formed, only :math:`E_k \rho`.
+
+    Parameters
+    ----------
+    operators: jnp.ndarray
+        Stacked measurement operators with the shape (K, d, d)
+    density_matrix: jnp.ndarray
+        Density matrix of the measured state
+
+    Returns
+    -------
+    jnp.ndarray
+        Probabilities of the outcomes
+    """
+    probabilities = jnp.einsum(
+        "kij,jl,kil->k", operators, density_matrix, jnp.conj(operators)
+    ).real
+    return probabilities / jnp.sum(probabilities)
+
+
+@jit
+def sample_outcome(
+    uniform: Union[float, jnp.ndarray], probabilities: jnp.ndarray
+) -> jnp.ndarray:
+    """
+    Samples an outcome index from the categorical distribution by inverting
+    its cumulative distribution with a single uniform sample. For a sample
+    drawn with `jax.random.uniform(key, ())` the outcome is the same as in
+    `jax.random.choice(key, len(probabilities), p=probabilities)`, but no
+    candidate array is materialized.
+
+    Parameters
+    ----------
+    uniform: Union[float, jnp.ndarray]
+        Uniform sample in [0, 1), usually `Config().random_uniform`
+    probabilities: jnp.ndarray
+        Probabilities of the outcomes
+
+    Returns
+    -------
+    jnp.ndarray
+        Index of the sampled outcome
+    """
+    cdf = jnp.cumsum(probabilities)
+    u = cdf[-1] * (1 - uniform)
+    return jnp.searchsorted(cdf, u)
+
+
+@jit
+def povm_update(operator: jnp.ndarray, density_matrix: jnp.ndarray) -> jnp.ndarray:
+    r"""
+    Computes the normalized post measurement state
+    :math:`E \rho E^\dagger / \mathrm{Tr}(E \rho E^\dagger)` in a single
+    jitted call
+
+    Parameters
+    ----------
+    operator: jnp.ndarray
+        Measurement operator of the observed outcome
+    density_matrix: jnp.ndarray
+        Density matrix before the measurement
+
+    Returns
+    -------
+    jnp.ndarray
+        Normalized density matrix after the measurement
+    """
+    new_state = jnp.einsum("ij,jk,lk->il", operator, density_matrix, jnp.conj(operator))
+    return new_state / jnp.trace(new_state)
+
+
+@jit
+def density_matrix_from_vector(vector: jnp.ndarray) -> jnp.ndarray:
+    r"""
+    Constructs the density matrix :math:`|\psi\rangle\langle\psi|` from
+    the state vector in a single fused kernel
+
+    Parameters
+    ----------
+    vector: jnp.ndarray
+        State vector with the shape (d, 1)
+
+    Returns
+    -------
+    jnp.ndarray
+        Density matrix with the shape (d, d)
+    """
+    flat = vector.ravel()
+    return jnp.outer(flat, jnp.conj(flat))
+
 
-    return new_density_matrix
+@jit
+def purity(density_matrix: jnp.ndarray) -> jnp.ndarray:
+    r"""
+    Computes the purity :math:`\mathrm{Tr}(\rho^2)` of the density matrix,
+    as :math:`\sum_{ij} \rho_{ij} \rho_{ji}`, without the matrix product
+
+    Parameters
+    ----------
+    density_matrix: jnp.ndarray
+        Density matrix
+
+    Returns
+    -------
+    jnp.ndarray
+        Purity of the state, 1 for pure states
+    """
+    return jnp.sum(density_matrix * density_matrix.T)
+
+
+@jit
+def pure_state_vector(density_matrix: jnp.ndarray) -> jnp.ndarray:
+    r"""
+    Extracts the state vector from the density matrix of a pure state.
+    Since :math:`\rho = |\psi\rangle\langle\psi|`, every column of the
+    density matrix is proportional to :math:`|\psi\rangle`. The column
+    with the largest diagonal element is normalized, which avoids the full
+    eigendecomposition.
+
+    Parameters
+    ----------
+    density_matrix: jnp.ndarray
+        Density matrix of a pure state
+
+    Returns
+    -------
+    jnp.ndarray
+        State vector with the shape (d, 1), defined up to a global phase
+    """
+    index = jnp.argmax(jnp.real(jnp.diag(density_matrix)))
+    vector = density_matrix[:, index]
+    return (vector / jnp.linalg.norm(vector)).reshape(-1, 1)
 
 
 def kraus_identity_check(
-    operators: List[Union[np.ndarray, jnp.ndarray]], tol: float = 1e-6
+    operators: List[Union[np.ndarray, jnp.ndarray]],
+    tol: float = 1e-6,
+    identity_matrix: Optional[jnp.ndarray] = None,
 ) -> bool:
     """
     Check if Kraus operators sum to the identity matrix.
@@ -380,16 +858,88 @@ def kraus_identity_check(
         List of the operators
     tol: float
         Tolerance for the floating-point comparisons
+    identity_matrix: Optional[jnp.ndarray]
+        Identity matrix to compare against, a cached identity of the
+        operator dimensions is used by default
 
     Returns
     -------
     bool
         True if the Kraus operators sum to identity within the tolerance
     """
-    dim = operators[0].shape[0]
-    identity_matrix = jnp.eye(dim)
-    sum_kraus = sum(jnp.matmul(jnp.conjugate(K.T), K) for K in operators)
-    return jnp.allclose(sum_kraus, identity_matrix, atol=tol).item()
+    if identity_matrix is None:
+        identity_matrix = identity_operator(int(operators[0].shape[0]))
+    # Stacked on every call, the check has to see the operators as they are now
+    stacked = jnp.stack([jnp.asarray(op) for op in operators])
+    return bool(_kraus_identity_check(stacked, identity_matrix, tol))
+
+
+@jit
+def _kraus_identity_check(
+    operators: jnp.ndarray, identity_matrix: jnp.ndarray, tol: float
+) -> jnp.ndarray:
+    r"""
+    Jitted completeness check of the stacked Kraus operators. The necessary
+    condition :math:`\sum_k \mathrm{Tr}(K_k^\dagger K_k) = d` costs a single
+    pass over the operators, the full sum :math:`\sum_k K_k^\dagger K_k` is
+    only formed when it holds.
+    """
+    dims = identity_matrix.shape[0]
+    total_trace = jnp.vdot(operators, operators).real
+    # Bound implied by allclose(atol=tol) on every diagonal element
+    trace_tol = dims * (tol + 1e-5)
+
+    def full_check(operators: jnp.ndarray) -> jnp.ndarray:
+        sum_kraus = jnp.einsum("kij,kil->jl", jnp.conj(operators), operators)
+        return jnp.allclose(sum_kraus, identity_matrix, atol=tol)
+
+    return jax.lax.cond(
+        jnp.abs(total_trace - dims) <= trace_tol,
+        full_check,
+        lambda operators: jnp.array(False),
+        operators,
+    )
+
+
+# Results of the completeness check, keyed on the identities of the jax
+# operators and the tolerance (see _cached_on_operators)
+_KRAUS_CHECK_CACHE: Dict[
+    Hashable, Tuple[Tuple[Union[np.ndarray, jnp.ndarray], ...], bool]
+] = {}
+_KRAUS_CHECK_CACHE_SIZE = 128
+
+
+def cached_kraus_identity_check(
+    operators: List[Union[np.ndarray, jnp.ndarray]], tol: float = 1e-6
+) -> bool:
+    """
+    Check if Kraus operators sum to the identity matrix, reusing the
+    result when the same jax operator objects were already checked.
+
+    Parameters
+    ----------
+    operators: List[Union[np.ndarray, jnp.ndarray]]
+        List of the operators
+    tol: float
+        Tolerance for the floating-point comparisons
+
+    Returns
+    -------
+    bool
+        True if the Kraus operators sum to identity within the tolerance
+
+    Notes
+    -----
+    Only immutable jax arrays are matched by identity, operators of other
+    types (e.g. numpy arrays) are checked on every call.
+    """
+    return _cached_on_operators(
+        _KRAUS_CHECK_CACHE,
+        _KRAUS_CHECK_CACHE_SIZE,
+        (tuple(id(op) for op in operators), tol),
+        operators,
+        lambda: kraus_identity_check(operators, tol),
+    )
 
 
 @jit
@@ -1,13 +1,39 @@
 import itertools
-from typing import TYPE_CHECKING, Dict, List
+from functools import lru_cache, wraps
+from typing import TYPE_CHECKING, Callable, Dict, List, Tuple, TypeVar
 
 if TYPE_CHECKING:
     from photon_weave.state.base_state import BaseState
 
+T = TypeVar("T")
 
-def apply_operator_vector(state_objs: list, operator_objs: list) -> str:
+# Integer indices of each operand followed by the indices of the result
+EinsumIndices = Tuple[Tuple[int, ...], ...]
+
+
+def _positional_cache(func: Callable[[list, list], T]) -> Callable[[list, list], T]:
+    """
+    Memoizes an einsum index constructor. The constructed indices only
+    depend on the number of states in the product space and on the
+    positions of the selected states, so the constructor is evaluated
+    with integer placeholders and cached on those positions.
+    """
+
+    @lru_cache(maxsize=1024)
+    def cached(num_states: int, positions: Tuple[int, ...]) -> T:
+        return func(list(range(num_states)), list(positions))
+
+    @wraps(func)
+    def wrapper(state_objs: list, states: list) -> T:
+        return cached(len(state_objs), tuple(state_objs.index(s) for s in states))
+
+    return wrapper
+
+
+@_positional_cache
+def apply_operator_vector(state_objs: list, operator_objs: list) -> EinsumIndices:
     """
-    Constructs an Einstein Sum string
+    Constructs Einstein Sum indices
     for multiplying an operator with a state vector, where
     operator can be applied to the subspace.
 
@@ -21,8 +47,9 @@ def apply_operator_vector(state_objs: list, operator_objs: list) -> str:
 
     Returns
     -------
-    str
-        Einstein string that achieves the application
+    EinsumIndices
+        Einstein sum indices of the operands followed by the indices
+        of the result, which achieve the application
 
     Notes
     -----
@@ -59,15 +86,13 @@ def apply_operator_vector(state_objs: list, operator_objs: list) -> str:
             einsum_list_list[2].append(einsum_dict[s][0])
     einsum_list_list[2].append(ed)
 
-    einsum_list_str: List[str] = [
-        "".join([chr(97 + i) for i in s]) for s in einsum_list_list
-    ]
-    return f"{einsum_list_str[0]},{einsum_list_str[1]}->{einsum_list_str[2]}"
+    return tuple(tuple(e) for e in einsum_list_list)
 
 
-def apply_operator_matrix(state_objs: list, operator_objs: list) -> str:
+@_positional_cache
+def apply_operator_matrix(state_objs: list, operator_objs: list) -> EinsumIndices:
     """
-    Constructs an Einstein Sum string
+    Constructs Einstein Sum indices
     for multiplying an operator with a density matrix, where
     operator can be applied to the subspace.
 
@@ -81,8 +106,9 @@ def apply_operator_matrix(state_objs: list, operator_objs: list) -> str:
 
     Returns
     -------
-    str
-        Einstein string that achieves the application
+    EinsumIndices
+        Einstein sum indices of the operands followed by the indices
+        of the result, which achieve the application
 
     Notes
     -----
@@ -98,8 +124,8 @@ def apply_operator_matrix(state_objs: list, operator_objs: list) -> str:
     Example usage:
 
     >>> state = original_state.reshape(dims)
-    >>> einsum = trace_out(state_objs, operator_objs)
-    >>> new_state = jnp.einsum(einsum, operator, state, jnp.conj(operator))
+    >>> einsum = apply_operator_matrix(state_objs, operator_objs)
+    >>> new_state = compute_einsum(einsum, operator, state, jnp.conj(operator))
     >>> new_state = new_state.reshape(new_dims)
 
     In this example:
@@ -107,7 +133,8 @@ def apply_operator_matrix(state_objs: list, operator_objs: list) -> str:
     - `state_objs` is the list of state objects.
     - `operator_objs` is the list of operator objects.
     - `operator` is the operator to be applied.
-    - `einsum` is the Einstein summation string generated by `trace_out`.
+    - `einsum` are the Einstein summation indices generated by
+      `apply_operator_matrix`.
     """
 
     einsum_list_list: List[List[int]] = [[], [], [], []]
@@ -153,13 +180,76 @@ def apply_operator_matrix(state_objs: list, operator_objs: list) -> str:
         else:
             einsum_list_list[3].append(einsum_dict[s][1])
 
-    einsum_list = ["".join([chr(97 + i) for i in s]) for s in einsum_list_list]
-    return f"{einsum_list[0]},{einsum_list[1]},{einsum_list[2]}->{einsum_list[3]}"
+    return tuple(tuple(e) for e in einsum_list_list)
+
+
+@_positional_cache
+def apply_operator_matrix_axes(state_objs: list, operator_objs: list) -> Tuple[
+    Tuple[Tuple[int, ...], Tuple[int, ...]],
+    Tuple[Tuple[int, ...], Tuple[int, ...]],
+    Tuple[int, ...],
+]:
+    """
+    Constructs the contraction axes for applying an operator to a
+    subspace of a density matrix with two tensor dot products, which
+    is equivalent to the application with the `apply_operator_matrix`
+    einsum indices.
+
+    Parameters
+    ----------
+    state_objs: List[BaseState]
+        List of all State objects which are in the product space
+        The order should reflect the order in the tensoring
+    operator_objs: List[BaseState]
+        List of State objects on which the operator should be applied
+
+    Returns
+    -------
+    Tuple
+        Axes for the first tensordot (operator, state), axes for the
+        second tensordot (intermediate, conjugated operator) and the
+        permutation which restores the order of the state axes
 
+    Notes
+    -----
+    - The arrays should not be transposed, only reshaped
 
-def trace_out_vector(state_objs: list, states: list) -> str:
+    Examples
+    --------
+    >>> state = original_state.reshape(dims)
+    >>> ax1, ax2, perm = apply_operator_matrix_axes(state_objs, operator_objs)
+    >>> new_state = jnp.tensordot(operator, state, axes=ax1)
+    >>> new_state = jnp.tensordot(new_state, jnp.conj(operator), axes=ax2)
+    >>> new_state = jnp.transpose(new_state, perm).reshape(new_dims)
+    """
+    n = len(state_objs)
+    k = len(operator_objs)
+    positions = [state_objs.index(s) for s in operator_objs]
+    rest = [i for i in range(n) if i not in positions]
+
+    # Operator input axes are contracted with the row axes of the state
+    first = (tuple(range(k, 2 * k)), tuple(positions))
+    # The intermediate holds operator output axes, the remaining row axes
+    # and all column axes; the operated column axes are contracted
+    # with the input axes of the conjugated operator
+    second = (tuple(n + p for p in positions), tuple(range(k, 2 * k)))
+
+    # Resulting axes: operator rows, remaining rows, remaining columns,
+    # operator columns
+    perm: List[int] = []
+    for offset_op, offset_rest in ((0, k), (2 * n - k, n)):
+        for i in range(n):
+            if i in positions:
+                perm.append(offset_op + positions.index(i))
+            else:
+                perm.append(offset_rest + rest.index(i))
+    return first, second, tuple(perm)
+
+
+@_positional_cache
+def trace_out_vector(state_objs: list, states: list) -> EinsumIndices:
     """
-    Produces an Einstein sum string. It's application traces out
+    Produces Einstein sum indices. It's application traces out
     the states which are not included in the states list when
     the states are in vector form
 
@@ -189,15 +279,13 @@ def trace_out_vector(state_objs: list, states: list) -> str:
     c = next(c1)
     einsum_list_list[0].append(c)
     einsum_list_list[1].append(c)
-    einsum_list = [[chr(97 + x) for x in string] for string in einsum_list_list]
-    einsum_str = ["".join(s) for s in einsum_list]
-
-    return f"{einsum_str[0]}->{einsum_str[1]}"
+    return tuple(tuple(e) for e in einsum_list_list)
 
 
-def trace_out_matrix(state_objs: list, states: list) -> str:
+@_positional_cache
+def trace_out_matrix(state_objs: list, states: list) -> EinsumIndices:
     """
-    Produces an Einstein sum string. It's application traces out
+    Produces Einstein sum indices. It's application traces out
     the states which are not included in the states list. Where
     the states are in matrix form.
 
@@ -226,14 +314,13 @@ def trace_out_matrix(state_objs: list, states: list) -> str:
                 einsum_list_list[0].append(c)
                 einsum_list_list[1].append(c)
 
-    einsum_list = ["".join([chr(97 + i) for i in s]) for s in einsum_list_list]
-    einsum_str = f"{einsum_list[0]}->{einsum_list[1]}"
-    return einsum_str
+    return tuple(tuple(e) for e in einsum_list_list)
 
 
-def reorder_vector(state_objs: list, states: list) -> str:
+@_positional_cache
+def reorder_vector(state_objs: list, states: list) -> EinsumIndices:
     """
-    Produces an Einstein sum string. It's application reorders
+    Produces Einstein sum indices. It's application reorders
     the states in the the product state vector
 
     Parameters
@@ -262,13 +349,13 @@ def reorder_vector(state_objs: list, states: list) -> str:
     einsum_list_list[1] = [einsum_dict[s] for s in states]
     einsum_list_list[1].append(other)
 
-    einsum_list = ["".join([chr(97 + s) for s in e]) for e in einsum_list_list]
-    return f"{einsum_list[0]}->{einsum_list[1]}"
+    return tuple(tuple(e) for e in einsum_list_list)
 
 
-def reorder_matrix(state_objs: list, states: list) -> str:
+@_positional_cache
+def reorder_matrix(state_objs: list, states: list) -> EinsumIndices:
     """
-    Produces an Einstein sum string. It's application traces out
+    Produces Einstein sum indices. It's application traces out
     the states which are not included in the states list when
     the states are in vector form
 
@@ -299,13 +386,13 @@ def reorder_matrix(state_objs: list, states: list) -> str:
             c = einsum_dict[s][i]
             einsum_list_list[1].append(c)
 
-    einsum_list = ["".join([chr(97 + s) for s in e]) for e in einsum_list_list]
-    return f"{einsum_list[0]}->{einsum_list[1]}"
+    return tuple(tuple(e) for e in einsum_list_list)
 
 
-def measure_vector(state_objs: list, states: list) -> str:
+@_positional_cache
+def measure_vector(state_objs: list, states: list) -> EinsumIndices:
     """
-    Produces an Einstein sum string. It's application exposes
+    Produces Einstein sum indices. It's application exposes
     the listed states, so they could be measured.
 
     Parameters
@@ -335,13 +422,13 @@ def measure_vector(state_objs: list, states: list) -> str:
     einsum_list_list[0].append(c)
     einsum_list_list[1].append(c)
 
-    einsum_list = ["".join([chr(97 + s) for s in e]) for e in einsum_list_list]
-    return f"{einsum_list[0]}->{einsum_list[1]}"
+    return tuple(tuple(e) for e in einsum_list_list)
 
 
-def measure_matrix(state_objs: list, states: list) -> str:
+@_positional_cache
+def measure_matrix(state_objs: list, states: list) -> EinsumIndices:
     """
-    Produces an Einstein sum string. It's application exposes
+    Produces Einstein sum indices. It's application exposes
     the listed states, so they could be measured.
 
     Parameters
@@ -367,5 +454,4 @@ def measure_matrix(state_objs: list, states: list) -> str:
                 einsum_list_list[1].append(c)
             einsum_list_list[0].append(c)
 
-    einsum_list = ["".join([chr(97 + s) for s in e]) for e in einsum_list_list]
-    return f"{einsum_list[0]}->{einsum_list[1]}"
+    return tuple(tuple(e) for e in einsum_list_list)
@@ -3,6 +3,8 @@ from typing import Callable, Dict, List
 import jax.numpy as jnp
 from jax.scipy.linalg import expm
 
+from photon_weave._math.ops import matrix_power
+
 
 def interpreter(
     expr: tuple,
@@ -50,6 +52,8 @@ def interpreter(
             >>> ('s_mult', 1,2,A) -> 2*A, where A is a matrix
             - m_mult: Matrix multiplication, accepts and number of arguments
             >>> ('m_mult', A,B,C) -> A@B@C
+            - pow: Matrix power, accepts a matrix and a non-negative integer
+            >>> ('pow', A, 3) -> A@A@A
             - div: Divides the values, accpets two arguments
             >>> ('div', A, B) -> A/B
             - kron: Kronecker multiplication, accepts and number of arguments
@@ -95,6 +99,11 @@ def interpreter(
             for arg in args[1:]:
                 result @= interpreter(arg, context, dimensions)
             return result
+        elif op == "pow":
+            return matrix_power(
+                interpreter(args[0], context, dimensions),
+                int(interpreter(args[1], context, dimensions)),
+            )
         elif op == "kron":
             result = interpreter(args[0], context, dimensions)
             for arg in args[1:]:
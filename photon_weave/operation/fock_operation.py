@@ -11,6 +11,7 @@ from photon_weave._math.ops import (
     annihilation_operator,
     creation_operator,
     displacement_operator,
+    identity_operator,
     phase_operator,
     squeezing_operator,
 )
@@ -205,7 +206,7 @@ class FockOperationType(Enum):
             case FockOperationType.Squeeze:
                 return squeezing_operator(dimensions[0], kwargs["zeta"])
             case FockOperationType.Identity:
-                return jnp.identity(dimensions[0])
+                return identity_operator(int(dimensions[0]))
             case FockOperationType.Expresion:
                 return interpreter(kwargs["expr"], kwargs["context"], dimensions)
             case FockOperationType.Custom:
@@ -1,3 +1,4 @@
+import jax
 import jax.numpy as jnp
 from typing import TYPE_CHECKING
 
@@ -5,6 +6,49 @@ if TYPE_CHECKING:
     from photon_weave.operation import Operation
 
 
+@jax.jit
+def _threshold_index(probabilities: jnp.ndarray, threshold: float) -> jnp.ndarray:
+    """
+    Index of the first element at which the cumulative sum of the
+    probabilities reaches the threshold, len(probabilities) if never
+    """
+    return jnp.searchsorted(jnp.cumsum(probabilities), threshold, side="left")
+
+
+@jax.jit
+def _vector_dimensions(
+    operator: jnp.ndarray, state: jnp.ndarray, threshold: float
+) -> jnp.ndarray:
+    """
+    Applies the operator to the state vector and computes the required
+    dimensions in a single dispatch, -1 if the dimensions do not suffice
+    """
+    resulting_state = jnp.dot(operator, state)
+    probabilities = jnp.abs(resulting_state[:, 0]) ** 2
+    index = _threshold_index(probabilities, threshold)
+    insufficient = (resulting_state[-1, 0] > (1 - threshold) * 1e-3) | (
+        index >= probabilities.shape[0]
+    )
+    return jnp.where(insufficient, -1, index + 3)
+
+
+@jax.jit
+def _matrix_dimensions(
+    operator: jnp.ndarray, state: jnp.ndarray, threshold: float
+) -> jnp.ndarray:
+    """
+    Applies the operator to the density matrix and computes the required
+    dimensions in a single dispatch, -1 if the dimensions do not suffice
+    """
+    resulting_state = operator @ state @ operator.T.conj()
+    probabilities = jnp.abs(jnp.diag(resulting_state))
+    index = _threshold_index(probabilities, threshold)
+    insufficient = (jnp.abs(resulting_state[-1, -1]) > (1 - threshold) * 1e-3) | (
+        index >= probabilities.shape[0]
+    )
+    return jnp.where(insufficient, -1, index + 3)
+
+
 class FockDimensions:
     """
     An estimator for fock dimensions, used when Displace, Squeeze or Expression
@@ -47,7 +91,8 @@ class FockDimensions:
             n = self._compute_dimensions()
             if n > 0:
                 return n
-            self._increase_dimensions(5)
+            # Grow geometrically, so the number of retries is logarithmic
+            self._increase_dimensions(max(5, self.dimensions))
 
     def _initial_estimate(self) -> None:
         """
@@ -82,37 +127,20 @@ class FockDimensions:
             were guessed. Dimensions should be increased then and this
             method needs to be tried again
         """
+        # The operator application, the tail check and the threshold search
+        # run in one jitted call, so every guess needs a single device sync
         if self.state.shape == (self.dimensions, 1):
             self.operation._dimensions = [self.dimensions]
             operator = self.operation._operation_type.compute_operator(
                 [self.dimensions], **self.operation.kwargs
             )
-            resulting_state = jnp.dot(operator, self.state)
-            cdf: float = 0
-            if resulting_state[-1, 0] > (1 - self.threshold) * 1e-3:
-                return -1
-            for i in range(len(resulting_state)):
-                tmp = jnp.abs(resulting_state[i][0]) ** 2
-                cdf += float(tmp)
-                if cdf >= self.threshold:
-                    return i + 3
-            return -1
+            return int(_vector_dimensions(operator, self.state, self.threshold))
         if self.state.shape == (self.dimensions, self.dimensions):
             self.operation._dimensions = [self.dimensions]
             operator = self.operation._operation_type.compute_operator(
                 [self.dimensions], **self.operation.kwargs
             )
-            resulting_state = operator @ self.state @ operator.T.conj()
-            cdf = 0
-            if jnp.abs(resulting_state[-1, -1]) > (1 - self.threshold) * 1e-3:
-                return -1
-            for i in range(self.dimensions):
-                tmp = jnp.abs(resulting_state[i, i])
-                cdf += float(tmp)
-
-                if cdf >= self.threshold:
-                    return i + 3
-            return -1
+            return int(_matrix_dimensions(operator, self.state, self.threshold))
         return -1
 
     def _increase_dimensions(self, amount: int = 1) -> None:
@@ -123,19 +151,15 @@ class FockDimensions:
             Amount of increase of the dimensions
         """
         if self.state.shape == (self.dimensions, 1):
-            pad = jnp.zeros((amount, 1), dtype=self.state.dtype)
-            # Vertically stack the padding with the current state
-            self.state = jnp.vstack([self.state, pad])
-            # Update the dimensions by the amount added
+            new_state = jnp.zeros((self.dimensions + amount, 1), dtype=self.state.dtype)
+            self.state = new_state.at[: self.dimensions, :].set(self.state)
             self.dimensions += amount
-        if self.state.shape == (self.dimensions, self.dimensions):
-            pad_rows = jnp.zeros((amount, self.dimensions), dtype=self.state.dtype)
-            pad_cols = jnp.zeros(
-                (self.dimensions + amount, amount), dtype=self.state.dtype
+        elif self.state.shape == (self.dimensions, self.dimensions):
+            new_dimensions = self.dimensions + amount
+            new_state = jnp.zeros(
+                (new_dimensions, new_dimensions), dtype=self.state.dtype
             )
-
-            self.state = jnp.vstack([self.state, pad_rows])
-
-            self.state = jnp.hstack([self.state, pad_cols])
-
-            self.dimensions += amount
+            self.state = new_state.at[: self.dimensions, : self.dimensions].set(
+                self.state
+            )
+            self.dimensions = new_dimensions
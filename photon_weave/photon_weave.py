@@ -1,13 +1,52 @@
 import random
 import sys
-from typing import Any
+from functools import partial
+from typing import Any, Tuple, Union
 
 import jax
 import jax.numpy as jnp
+import numpy as np
+
+
+@partial(jax.jit, static_argnums=(1,))
+def _split_keys(key: jnp.ndarray, num: int) -> Tuple[jnp.ndarray, jnp.ndarray]:
+    """
+    Performs `num` consecutive splits of the key in a single dispatch
+
+    Parameters
+    ----------
+    key: jnp.ndarray
+        Key to start splitting from
+    num: int
+        Number of keys to produce
+
+    Returns
+    -------
+    Tuple[jnp.ndarray, jnp.ndarray]
+        Stacked keys, in the order they would be produced by repeated
+        `jax.random.split` calls, and the key to continue splitting from
+    """
+
+    def step(carry: jnp.ndarray, _: None) -> Tuple[jnp.ndarray, jnp.ndarray]:
+        new_key, carry = jax.random.split(carry)
+        return carry, new_key
+
+    last_key, keys = jax.lax.scan(step, key, None, length=num)
+    return keys, last_key
+
+
+@jax.jit
+def _draw_uniforms(keys: jnp.ndarray) -> jnp.ndarray:
+    """
+    Draws one uniform sample in [0, 1) from each of the stacked keys, the
+    samples equal `jax.random.uniform(key, ())` for the individual keys
+    """
+    return jax.vmap(lambda key: jax.random.uniform(key, (), dtype=jnp.float64))(keys)
 
 
 class Config:
     _instance = None
+    _key_pool_size = 1024
 
     def __new__(cls, *args: Any, **kwargs: Any) -> "Config":
         if cls._instance is None:
@@ -19,7 +58,13 @@ class Config:
             self._initialized = True  # Prevents reinitialization
             self._random_seed = random.randint(0, sys.maxsize)
             self._key = jax.random.PRNGKey(self._random_seed)
+            self._key_pool: np.ndarray = np.empty((0, 2), dtype=np.uint32)
+            self._key_pool_index = 0
+            self._uniform_pool: np.ndarray = np.empty((0,))
+            self._uniform_pool_index = 0
             self._contractions = True
+            self._dtype: jnp.dtype = jnp.dtype(jnp.complex128)
+            self._kraus_identity_check = True
 
     def set_seed(self, seed: int) -> None:
         """
@@ -31,22 +76,136 @@ class Config:
         """
         self._random_seed = seed
         self._key = jax.random.PRNGKey(seed)
+        self._key_pool = np.empty((0, 2), dtype=np.uint32)
+        self._key_pool_index = 0
+        self._uniform_pool = np.empty((0,))
+        self._uniform_pool_index = 0
 
     @property
     def random_seed(self) -> int:
         return self._random_seed
 
     @property
-    def random_key(self) -> jnp.ndarray:
+    def random_key(self) -> np.ndarray:
         """
         Splits the current key and returns a new one for random operations
+
+        Notes
+        -----
+        Keys are split in batches and handed out from a pool, the sequence
+        of keys is the same as with splitting the key on every access. The
+        pool is moved to the host once per batch, so handing out a key does
+        not dispatch any device operation
         """
-        key, self._key = jax.random.split(self._key)
+        if self._key_pool_index >= self._key_pool.shape[0]:
+            self._refill_key_pool()
+        key = self._key_pool[self._key_pool_index]
+        self._key_pool_index += 1
         return key
 
+    def _refill_key_pool(self) -> None:
+        """
+        Splits a new batch of keys and moves it to the host at once
+        """
+        key_pool, self._key = _split_keys(self._key, self._key_pool_size)
+        self._key_pool = np.asarray(key_pool)
+        self._key_pool_index = 0
+
+    def _take_keys(self, num: int) -> np.ndarray:
+        """
+        Takes the next `num` keys from the pool, refilling it as needed
+        """
+        keys = []
+        while num > 0:
+            if self._key_pool_index >= self._key_pool.shape[0]:
+                self._refill_key_pool()
+            take = min(num, self._key_pool.shape[0] - self._key_pool_index)
+            keys.append(
+                self._key_pool[self._key_pool_index : self._key_pool_index + take]
+            )
+            self._key_pool_index += take
+            num -= take
+        return np.concatenate(keys)
+
+    def prefetch_random(self, num: int) -> None:
+        """
+        Draws `num` uniform samples in a single dispatch and moves them to
+        the host at once. The following `num` measurements consume these
+        samples instead of drawing one on the device each.
+
+        Parameters
+        ----------
+        num: int
+            Number of samples to prefetch
+
+        Notes
+        -----
+        The samples are drawn from the keys `random_key` would hand out, so
+        seeded simulations produce the same outcomes with or without
+        prefetching
+        """
+        if num < 0:
+            raise ValueError(f"Number of samples must be non-negative, got {num}")
+        if num == 0:
+            return
+        remaining = self._uniform_pool[self._uniform_pool_index :]
+        uniforms = np.asarray(_draw_uniforms(self._take_keys(num)))
+        self._uniform_pool = np.concatenate([remaining, uniforms])
+        self._uniform_pool_index = 0
+
+    @property
+    def random_uniform(self) -> Union[float, jnp.ndarray]:
+        """
+        Returns a uniform sample in [0, 1), taken from the prefetched samples
+        if any are left, otherwise drawn on the device with a new random key
+        """
+        if self._uniform_pool_index < self._uniform_pool.shape[0]:
+            uniform = self._uniform_pool[self._uniform_pool_index]
+            self._uniform_pool_index += 1
+            return float(uniform)
+        return jax.random.uniform(self.random_key, (), dtype=jnp.float64)
+
     def set_contraction(self, cs: bool) -> None:
         self._contractions = cs
 
     @property
     def contractions(self) -> bool:
         return self._contractions
+
+    def set_dtype(self, dtype: Any) -> None:
+        """
+        Sets the complex dtype of the operators constructed by the library.
+        complex128 is used by default, complex64 halves the memory traffic
+        at the cost of precision (about 7 significant digits)
+
+        Parameters
+        ----------
+        dtype: Any
+            Either jnp.complex64 or jnp.complex128
+        """
+        dtype = jnp.dtype(dtype)
+        if dtype not in (jnp.dtype(jnp.complex64), jnp.dtype(jnp.complex128)):
+            raise ValueError(
+                f"Only complex64 and complex128 dtypes are supported, got {dtype}"
+            )
+        self._dtype = dtype
+
+    @property
+    def dtype(self) -> jnp.dtype:
+        return self._dtype
+
+    def set_kraus_identity_check(self, check: bool) -> None:
+        """
+        Globally enables or disables the check whether the applied Kraus
+        operators sum up to the identity, enabled by default
+
+        Parameters
+        ----------
+        check: bool
+            If False, the Kraus operators are applied without the check
+        """
+        self._kraus_identity_check = check
+
+    @property
+    def kraus_identity_check(self) -> bool:
+        return self._kraus_identity_check
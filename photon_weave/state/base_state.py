@@ -3,11 +3,20 @@ from enum import Enum
 from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
 from uuid import UUID, uuid4
 
-import jax
 import jax.numpy as jnp
 import numpy as np
 
-from photon_weave._math.ops import apply_kraus, kraus_identity_check
+from photon_weave._math.ops import (
+    apply_kraus,
+    cached_kraus_identity_check,
+    density_matrix_from_vector,
+    povm_probabilities,
+    povm_update,
+    pure_state_vector,
+    purity,
+    sample_outcome,
+    stack_operators,
+)
 from photon_weave.photon_weave import Config
 from photon_weave.state.expansion_levels import ExpansionLevel
 
@@ -17,7 +26,39 @@ if TYPE_CHECKING:
     from photon_weave.state.polarization import PolarizationLabel
 
 
+def format_complex_rows(
+    state: Union[np.ndarray, jnp.ndarray], separator: str
+) -> List[str]:
+    """
+    Formats the rows of a vector or a matrix for the state representations.
+    Every entry is formatted as `+0.00 + 0.00j` and each row is enclosed in
+    `⎢ ... ⎥`. The formatting is vectorized with numpy, so the array is only
+    transferred from the device once.
+
+    Parameters
+    ----------
+    state: Union[np.ndarray, jnp.ndarray]
+        Two dimensional array to format
+    separator: str
+        String placed between the entries of a row
+
+    Returns
+    -------
+    List[str]
+        Formatted rows
+    """
+    arr = np.asarray(state)
+    real = np.char.mod("%+.2f", arr.real)
+    sign = np.where(arr.imag >= 0, " + ", " - ")
+    imag = np.char.mod("%.2fj", np.abs(arr.imag))
+    entries = np.char.add(np.char.add(real, sign), imag)
+    return ["⎢ " + separator.join(row) + " ⎥" for row in entries.tolist()]
+
+
 class BaseState(ABC):
+    # States with more dimensions are not printed in full
+    _repr_max_dimensions = 16
+
     __slots__ = (
         "label",
         "_uid",
@@ -112,32 +153,15 @@ class BaseState(ABC):
         if self.index is not None or self.measured:
             return str(self.uid)
 
+        elif self.dimensions > self._repr_max_dimensions:
+            # Avoid printing large vectors and matrices
+            return f"<{type(self).__name__} dim={self.dimensions}>"
         elif self.expansion_level == ExpansionLevel.Vector:
             # Handle cases where the vector has only one element
             assert isinstance(self.state, jnp.ndarray)
             formatted_vector: Union[str, List[str]]
 
-            formatted_vector = ""
-            for row in self.state:
-                formatted_row = "⎢ "  # Start each row with the ⎢ symbol
-                for num in row:
-                    # Format real part
-                    formatted_row += (
-                        f"{num.real:+.2f} "  # Include a space after the real part
-                    )
-
-                    # Add either "+" or "-" for the imaginary part based on the sign
-                    if num.imag >= 0:
-                        formatted_row += "+ "
-                    else:
-                        formatted_row += "- "
-
-                    # Format the imaginary part and add "j"
-                    formatted_row += f"{abs(num.imag):.2f}j "
-
-                formatted_row = formatted_row.strip() + " ⎥\n"
-                formatted_vector += formatted_row
-            formatted_vector = formatted_vector.strip().split("\n")
+            formatted_vector = format_complex_rows(self.state, " ")
             formatted_vector[0] = "⎡ " + formatted_vector[0][2:-1] + "⎤"
             formatted_vector[-1] = "⎣ " + formatted_vector[-1][2:-1] + "⎦"
             formatted_vector = "\n".join(formatted_vector)
@@ -148,24 +172,7 @@ class BaseState(ABC):
             assert self.state.shape == (self.dimensions, self.dimensions)
 
             formatted_matrix: Union[str, List[str]]
-            formatted_matrix = ""
-
-            for row in self.state:
-                formatted_row = "⎢ "
-                for num in row:
-                    formatted_row += f"{num.real:+.2f} "
-
-                    if num.imag >= 0:
-                        formatted_row += "+ "
-                    else:
-                        formatted_row += "- "
-
-                    formatted_row += f"{abs(num.imag):.2f}j   "
-
-                formatted_row = formatted_row.strip() + " ⎥\n"
-                formatted_matrix += formatted_row
-
-            formatted_matrix = formatted_matrix.strip().split("\n")
+            formatted_matrix = format_complex_rows(self.state, "   ")
             formatted_matrix[0] = "⎡" + formatted_matrix[0][1:-1] + "⎤"
             formatted_matrix[-1] = "⎣" + formatted_matrix[-1][1:-1] + "⎦"
             formatted_matrix = "\n".join(formatted_matrix)
@@ -180,7 +187,9 @@ class BaseState(ABC):
     ) -> None:
         """
         Apply Kraus operators to the state.
-        State is automatically expanded to the density matrix representation
+        State is automatically expanded to the density matrix representation,
+        unless a single operator is applied to a pure state and contractions
+        are enabled. Then the operator is applied to the state vector.
 
         Parameters
         ----------
@@ -190,20 +199,34 @@ class BaseState(ABC):
             Signal to check whether or not the operators sum up to identity,
             True by default
         """
+        C = Config()
 
-        assert isinstance(self.expansion_level, ExpansionLevel)
-        while self.expansion_level < ExpansionLevel.Matrix:
-            self.expand()
+        # A single Kraus operator maps a pure state to a pure state
+        # (K|ψ⟩⟨ψ|K† = K|ψ⟩(K|ψ⟩)†), so the density matrix is not needed
+        required_level = ExpansionLevel.Matrix
+        if len(operators) == 1 and C.contractions:
+            required_level = ExpansionLevel.Vector
+
+        self._expand_to(required_level)
 
         for op in operators:
             if not op.shape == (self.dimensions, self.dimensions):
                 raise ValueError("Operator dimensions do not match state dimensions")
 
-        if not kraus_identity_check(operators):
+        if (
+            identity_check
+            and C.kraus_identity_check
+            and not cached_kraus_identity_check(operators)
+        ):
             raise ValueError("Kraus operators do not sum to the identity")
 
-        self.state = apply_kraus(self.state, operators)
-        C = Config()
+        if self.expansion_level == ExpansionLevel.Vector:
+            assert isinstance(self.state, jnp.ndarray)
+            self.state = jnp.matmul(operators[0], self.state)
+        else:
+            # Operators are stacked, so they are applied in a single batched product
+            stacked_operators = stack_operators(operators)
+            self.state = apply_kraus(self.state, stacked_operators)
         if C.contractions:
             self.contract()
 
@@ -211,6 +234,29 @@ class BaseState(ABC):
     def expand(self) -> None:
         pass
 
+    def _expand_to(self, target: ExpansionLevel) -> None:
+        """
+        Expands the state up to the target expansion level. A state vector is
+        expanded to the density matrix in one jitted outer product. If the
+        state is part of a product state, the expansion is routed there.
+
+        Parameters
+        ----------
+        target: ExpansionLevel
+            Expansion level the state should (at least) be in
+        """
+        assert isinstance(self.expansion_level, ExpansionLevel)
+        if self.index is not None:
+            while self.expansion_level < target:
+                self.expand()
+            return
+        if self.expansion_level < ExpansionLevel.Vector <= target:
+            self.expand()
+        if self.expansion_level < ExpansionLevel.Matrix <= target:
+            assert isinstance(self.state, jnp.ndarray)
+            self.state = density_matrix_from_vector(self.state)
+            self.expansion_level = ExpansionLevel.Matrix
+
     @abstractmethod
     def _set_measured(self) -> None:
         pass
@@ -238,16 +284,10 @@ class BaseState(ABC):
         ):
             # Check if the state is pure state
             assert isinstance(self.state, jnp.ndarray)
-            state_squared = jnp.matmul(self.state, self.state)
-            state_trace = jnp.trace(state_squared)
+            state_trace = purity(self.state)
             if jnp.abs(state_trace - 1) < tol:
                 # The state is pure
-                eigenvalues, eigenvectors = jnp.linalg.eigh(self.state)
-                pure_state_index = jnp.argmax(jnp.abs(eigenvalues - 1.0) < tol)
-                assert (
-                    pure_state_index is not None
-                ), "pure_state_index should not be None"
-                self.state = eigenvectors[:, pure_state_index].reshape(-1, 1)
+                self.state = pure_state_vector(self.state)
                 # Normalizing the phase
                 assert isinstance(self.state, jnp.ndarray)
                 phase = jnp.exp(-1j * jnp.angle(self.state[0]))
@@ -299,40 +339,23 @@ class BaseState(ABC):
             assert isinstance(self.composite_envelope, CompositeEnvelope)
             return self.composite_envelope.measure_POVM(operators, self)
 
-        assert isinstance(self.expansion_level, ExpansionLevel)
-        while self.expansion_level < ExpansionLevel.Matrix:
-            self.expand()
+        self._expand_to(ExpansionLevel.Matrix)
 
         assert isinstance(self.state, jnp.ndarray)
         assert self.state.shape == (self.dimensions, self.dimensions)
 
         # Compute probabilities p(i) = Tr(E_i * rho) for each POVM operator E_i
-        probabilities = jnp.array(
-            [jnp.trace(jnp.matmul(op, self.state)).real for op in operators]
-        )
-
-        # Normalize probabilities (handle numerical issues)
-        probabilities = probabilities / jnp.sum(probabilities)
-
-        # Generate a random key
-        C = Config()
-        key = C.random_key
+        probabilities = povm_probabilities(stack_operators(operators), self.state)
 
         # Sample the measurement outcome
-        outcome = int(
-            jax.random.choice(key, a=jnp.arange(len(operators)), p=probabilities)
-        )
+        C = Config()
+        outcome = int(sample_outcome(C.random_uniform, probabilities))
 
         result: Tuple[int, Dict["BaseState", int]] = (outcome, {})
         if destructive:
             self._set_measured()
         else:
-            self.state = jnp.matmul(
-                operators[outcome],
-                jnp.matmul(self.state, jnp.conj(operators[outcome].T)),
-            )
-
-            self.state = self.state / jnp.trace(self.state)
+            self.state = povm_update(operators[outcome], self.state)
             self.expansion_level = ExpansionLevel.Matrix
 
         if not partial:
@@ -2,16 +2,22 @@ import uuid
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union, cast
 
-import jax
 import jax.numpy as jnp
 import numpy as np
 
 # from photon_weave.extra.einsum_constructor import EinsumStringConstructor as ESC
 import photon_weave.extra.einsum_constructor as ESC
 from photon_weave._math.ops import (
-    kraus_identity_check,
+    apply_operator_tensordot,
+    cached_kraus_identity_check,
+    compute_einsum,
+    kraus_probabilities,
     num_quanta_matrix,
     num_quanta_vector,
+    pure_state_vector,
+    purity,
+    sample_outcome,
+    stack_operators,
 )
 from photon_weave.operation import (
     CustomStateOperationType,
@@ -66,13 +72,10 @@ class ProductState:
         """
         if self.expansion_level is ExpansionLevel.Matrix:
             # If the state is mixed, return
-            if jnp.abs(jnp.trace(jnp.matmul(self.state, self.state)) - 1) >= tol:
+            if jnp.abs(purity(self.state) - 1) >= tol:
                 return
 
-            eigenvalues, eigenvectors = jnp.linalg.eigh(self.state)
-            pure_state_index = jnp.argmax(jnp.abs(eigenvalues - 1.0) < tol)
-            assert pure_state_index is not None, "Pure state indx should not be None"
-            self.state = eigenvectors[:, pure_state_index].reshape(-1, 1)
+            self.state = pure_state_vector(self.state)
             for state in self.state_objs:
                 state.expansion_level = ExpansionLevel.Vector
             self.expansion_level = ExpansionLevel.Vector
@@ -100,7 +103,7 @@ class ProductState:
             einsum = ESC.reorder_vector(self.state_objs, list(ordered_states))
 
             # Perform the reordering
-            state = jnp.einsum(einsum, state)
+            state = compute_einsum(einsum, state)
 
             # Reshape and store the state
             self.state = state.reshape(-1, 1)
@@ -116,7 +119,7 @@ class ProductState:
             einsum = ESC.reorder_matrix(self.state_objs, list(ordered_states))
 
             # Perform reordering
-            state = jnp.einsum(einsum, state)
+            state = compute_einsum(einsum, state)
 
             # Reshape and reorder self.state_objs to reflect the new order
             new_dims = jnp.prod(jnp.array([s.dimensions for s in ordered_states]))
@@ -174,19 +177,14 @@ class ProductState:
                 einsum = ESC.measure_vector(remaining_states, [state])
 
                 # Project the state with einsum string
-                projected_state = jnp.einsum(einsum, ps)
+                projected_state = compute_einsum(einsum, ps)
 
                 # Outcome Probabilities
                 probabilities = jnp.abs(projected_state.flatten()) ** 2
                 probabilities /= jnp.sum(probabilities)
 
                 # Decide on output
-                key = C.random_key
-                outcomes[state] = int(
-                    jax.random.choice(
-                        key, a=jnp.array(list(range(state.dimensions))), p=probabilities
-                    )
-                )
+                outcomes[state] = int(sample_outcome(C.random_uniform, probabilities))
 
                 # Construct the post measurement state
                 # Even if the state is measured non_destructively
@@ -228,19 +226,14 @@ class ProductState:
                 einsum = ESC.measure_matrix(remaining_states, [state])
 
                 # Project the state with einsum
-                projected_state = jnp.einsum(einsum, ps)
+                projected_state = compute_einsum(einsum, ps)
 
                 # Outcome Probabilities
                 probabilities = jnp.abs(jnp.diag(projected_state))
                 probabilities /= sum(probabilities)
 
                 # Decide on outcome
-                key = C.random_key
-                outcomes[state] = int(
-                    jax.random.choice(
-                        key, a=jnp.array(list(range(state.dimensions))), p=probabilities
-                    )
-                )
+                outcomes[state] = int(sample_outcome(C.random_uniform, probabilities))
 
                 # Construct post measurement state
                 # Even if state is measured in non_destructive manner
@@ -323,55 +316,39 @@ class ProductState:
 
         # Transform the operators to the tensors
         op_shape = [s.dimensions for s in states] * 2
-
-        # Reshape operators
-        operators = [op.reshape(op_shape) for op in operators]
+        stacked_operators = stack_operators(operators)
 
         # Get and reshape the state
         ps = self.state.reshape([s.dimensions for s in self.state_objs] * 2)
 
-        # Generate the operators for application of operators
-        einsum = ESC.apply_operator_matrix(self.state_objs, list(states))
-
-        # Get the probabilities
-        prob_list: List[float] = []
+        # Generate the contraction axes for application of operators
+        axes = ESC.apply_operator_matrix_axes(self.state_objs, list(states))
 
         # Get the dimensions of the measured states
         to_dims = jnp.prod(jnp.array([so.dimensions for so in states]))
 
-        for op in operators:
-            # Apply each operator
-            prob_state = jnp.einsum(einsum, op, ps, jnp.conj(op))
-
-            # Trace out the state to get the probabilities
-            einsum_to = ESC.trace_out_matrix(self.state_objs, list(states))
-            prob_state_to = jnp.einsum(einsum_to, prob_state).reshape(
-                (to_dims, to_dims)
-            )
+        # The operators only act on the measured states, so the probabilities
+        # are computed on the reduced state, traced out once for all operators
+        einsum_to = ESC.trace_out_matrix(self.state_objs, list(states))
+        reduced_state = compute_einsum(einsum_to, ps)
 
-            # Compute the outcome probability
-            prob_list.append(float(jnp.trace(prob_state_to).real))
+        # Reorder the reduced state to the tensoring order of the operators
+        measured = [so for so in self.state_objs if so in states]
+        perm = [measured.index(s) for s in states]
+        reduced_state = reduced_state.transpose(
+            [*perm, *[p + len(perm) for p in perm]]
+        ).reshape((to_dims, to_dims))
 
-        # Normalize the probabilities
-        probabilities = jnp.array(prob_list)
-        probabilities /= jnp.sum(probabilities)
+        probabilities = kraus_probabilities(stacked_operators, reduced_state)
 
         # Decide on the outcomes
         C = Config()
-        key = C.random_key
-        outcome = int(
-            jax.random.choice(
-                key,
-                a=jnp.array(list(range(len(operators)))),
-                p=jnp.array(probabilities),
-            )
-        )
+        outcome = int(sample_outcome(C.random_uniform, probabilities))
 
         # Construct Post Measurement state
         new_dims = jnp.prod(jnp.array([s.dimensions for s in self.state_objs]))
-        ps = jnp.einsum(
-            einsum, operators[outcome], ps, jnp.conj(operators[outcome])
-        ).reshape((new_dims, new_dims))
+        operator = operators[outcome].reshape(op_shape)
+        ps = apply_operator_tensordot(operator, ps, axes).reshape((new_dims, new_dims))
         self.state = ps / jnp.trace(ps)
         other_outcomes = {}
         if destructive:
@@ -420,7 +397,7 @@ class ProductState:
             resulting_state = jnp.zeros_like(ps)
 
             for op in operators:
-                resulting_state += jnp.einsum(einsum, op, ps)
+                resulting_state += compute_einsum(einsum, op, ps)
 
             # Reshape the resulting state back into vector and store it
             self.state = resulting_state.reshape(-1, 1)
@@ -433,15 +410,15 @@ class ProductState:
             op_shape = [s.dimensions for s in states] * 2
             operators = [op.reshape(op_shape) for op in operators]
 
-            # Genetate einsum
-            einsum = ESC.apply_operator_matrix(self.state_objs, list(states))
+            # Genetate contraction axes
+            axes = ESC.apply_operator_matrix_axes(self.state_objs, list(states))
 
             # Generate a new state to sum into
             resulting_state = jnp.zeros_like(ps)
 
             # Apply all operators
             for op in operators:
-                resulting_state += jnp.einsum(einsum, op, ps, jnp.conj(op))
+                resulting_state += apply_operator_tensordot(op, ps, axes)
 
             # Compute matrix dimensions
             dims = jnp.prod(jnp.array([s.dimensions for s in self.state_objs]))
@@ -477,7 +454,7 @@ class ProductState:
             einsum = ESC.trace_out_vector(self.state_objs, list(states))
 
             # Perform the tracing
-            traced_out_state = jnp.einsum(einsum, ps)
+            traced_out_state = compute_einsum(einsum, ps)
 
             # Reshape and return
             return traced_out_state.reshape((-1, 1))
@@ -489,7 +466,7 @@ class ProductState:
             einsum = ESC.trace_out_matrix(self.state_objs, list(states))
 
             # Perform the tracing
-            traced_out_state = jnp.einsum(einsum, ps)
+            traced_out_state = compute_einsum(einsum, ps)
 
             # Compute the new dimensions
             new_dims = jnp.prod(jnp.array([s.dimensions for s in states]))
@@ -670,7 +647,7 @@ class ProductState:
             einsum = ESC.apply_operator_vector(self.state_objs, list(states))
 
             # Constructing einsum string
-            ps = jnp.einsum(einsum, operator, ps)
+            ps = compute_einsum(einsum, operator, ps)
 
             if not jnp.any(jnp.abs(ps) > 0):
                 raise ValueError(
@@ -691,11 +668,11 @@ class ProductState:
             # Get the operator and Reshape it
             operator = operation.operator.reshape([s.dimensions for s in states] * 2)
 
-            # Generate Einstein sum string
-            einsum = ESC.apply_operator_matrix(self.state_objs, list(states))
+            # Generate the contraction axes
+            axes = ESC.apply_operator_matrix_axes(self.state_objs, list(states))
 
-            # Apply the Einstein Summation
-            ps = jnp.einsum(einsum, operator, ps, jnp.conj(operator))
+            # Apply the operator
+            ps = apply_operator_tensordot(operator, ps, axes)
 
             if not jnp.any(jnp.abs(ps) > 0):
                 raise ValueError(
@@ -1244,8 +1221,8 @@ class CompositeEnvelope:
                 )
 
         # Check the identity sum
-        if identity_check:
-            if not kraus_identity_check(operators):
+        if identity_check and Config().kraus_identity_check:
+            if not cached_kraus_identity_check(operators):
                 raise ValueError("Kraus operators do not sum to the identity")
 
         # Get product states
@@ -8,11 +8,19 @@ such as qubits or quantum dots
 import uuid
 from typing import Dict, List, Optional, Tuple, Union
 
-import jax
 import jax.numpy as jnp
 import numpy as np
 
-from photon_weave._math.ops import apply_kraus, kraus_identity_check
+from photon_weave._math.ops import (
+    apply_kraus,
+    cached_kraus_identity_check,
+    povm_probabilities,
+    povm_update,
+    pure_state_vector,
+    purity,
+    sample_outcome,
+    stack_operators,
+)
 from photon_weave.operation import CustomStateOperationType, Operation
 from photon_weave.photon_weave import Config
 from photon_weave.state.base_state import BaseState
@@ -21,6 +29,8 @@ from photon_weave.state.expansion_levels import ExpansionLevel
 
 
 class CustomState(BaseState):
+    __slots__ = ("_dimensions_set",)
+
     def __init__(self, dimensions: int):
         self.uid = uuid.uuid4()
         # Custom state can only be separate or part of composite envelope
@@ -30,7 +40,7 @@ class CustomState(BaseState):
         # Initialize in the |0> state
         self.state: Optional[Union[int, jnp.ndarray]] = 0
         self.expansion_level = ExpansionLevel.Label
-        self.composite_envelope: Optional["CompositeEnvelope"] = None
+        self.composite_envelope = None
 
     @property
     def uid(self) -> Union[str, uuid.UUID]:
@@ -72,13 +82,13 @@ class CustomState(BaseState):
             assert isinstance(self.state, int)
             assert self.state >= 0 and self.state < self.dimensions
             index_value = self.state
-            self.state = jnp.zeros((self.dimensions, 1))
+            self.state = jnp.zeros((self.dimensions, 1), dtype=Config().dtype)
             self.state = self.state.at[index_value].set(1.0)
             self.expansion_level = ExpansionLevel.Vector
         elif self.expansion_level == ExpansionLevel.Vector:
             assert isinstance(self.state, jnp.ndarray)
             assert self.state.shape == (self.dimensions, 1)
-            self.state = jnp.dot(self.state, self.state.T)
+            self.state = jnp.dot(self.state, jnp.conj(self.state.T))
             self.expansion_level = ExpansionLevel.Matrix
 
     def contract(
@@ -104,16 +114,10 @@ class CustomState(BaseState):
                 self.dimensions,
                 self.dimensions,
             ), "Dimensions do not match"
-            state_squared = jnp.matmul(self.state, self.state)
-            state_trace = jnp.trace(state_squared)
+            state_trace = purity(self.state)
             if jnp.abs(state_trace - 1) < tol:
                 # The state is pure
-                eigenvalues, eigenvectors = jnp.linalg.eigh(self.state)
-                pure_state_index = jnp.argmax(jnp.abs(eigenvalues - 1.0) < tol)
-                assert (
-                    pure_state_index is not None
-                ), "pure_state_index should not be None"
-                self.state = eigenvectors[:, pure_state_index].reshape(-1, 1)
+                self.state = pure_state_vector(self.state)
                 assert isinstance(self.state, jnp.ndarray)
                 phase = jnp.exp(-1j * jnp.angle(self.state[0]))
                 self.state = self.state * phase
@@ -195,12 +199,7 @@ class CustomState(BaseState):
                 probabilities = jnp.abs(self.state.flatten()) ** 2
                 probabilities = probabilities.ravel()
                 assert jnp.isclose(sum(probabilities), 1)
-                key = C.random_key
-                out = int(
-                    jax.random.choice(
-                        key, a=jnp.array(len(probabilities)), p=probabilities
-                    )
-                )
+                out = int(sample_outcome(C.random_uniform, probabilities))
                 self.state = out
                 self.expansion_level = ExpansionLevel.Label
                 return {self: out}
@@ -210,12 +209,7 @@ class CustomState(BaseState):
                 C = Config()
                 probabilities = jnp.diag(self.state).real
                 probabilities = probabilities / jnp.sum(probabilities)
-                key = C.random_key
-                out = int(
-                    jax.random.choice(
-                        key, a=jnp.array(len(probabilities)), p=probabilities
-                    )
-                )
+                out = int(sample_outcome(C.random_uniform, probabilities))
                 self.state = out
                 self.expansion_level = ExpansionLevel.Label
                 return {self: out}
@@ -256,26 +250,15 @@ class CustomState(BaseState):
         for op in operators:
             assert op.shape == (self.dimensions, self.dimensions)
 
-        assert isinstance(self.expansion_level, ExpansionLevel)
-        while self.expansion_level < ExpansionLevel.Matrix:
-            self.expand()
+        self._expand_to(ExpansionLevel.Matrix)
 
         C = Config()
 
         assert isinstance(self.state, jnp.ndarray)
-        probabilities = jnp.array(
-            [jnp.trace(jnp.matmul(op, self.state)).real for op in operators]
-        )
-        probabilities = probabilities / jnp.sum(probabilities)
-
-        key = C.random_key
-        outcome = int(
-            jax.random.choice(key, a=jnp.arange(len(operators)), p=probabilities)
-        )
-        self.state = jnp.matmul(
-            operators[outcome], jnp.matmul(self.state, jnp.conj(operators[outcome].T))
-        )
-        self.state = self.state / jnp.trace(self.state)
+        probabilities = povm_probabilities(stack_operators(operators), self.state)
+
+        outcome = int(sample_outcome(C.random_uniform, probabilities))
+        self.state = povm_update(operators[outcome], self.state)
 
         if C.contractions:
             self.contract()
@@ -302,8 +285,7 @@ class CustomState(BaseState):
             assert isinstance(self.composite_envelope, CompositeEnvelope)
             self.composite_envelope.apply_kraus(operators, self)
 
-        while self.expansion_level != ExpansionLevel.Matrix:
-            self.expand()
+        self._expand_to(ExpansionLevel.Matrix)
 
         for op in operators:
             if op.shape != (self.dimensions, self.dimensions):
@@ -312,11 +294,17 @@ class CustomState(BaseState):
                     f"expected ({self.dimensions},{self.dimensions})"
                 )
 
-        if not kraus_identity_check(operators):
+        C = Config()
+        if (
+            identity_check
+            and C.kraus_identity_check
+            and not cached_kraus_identity_check(operators)
+        ):
             raise ValueError("Kraus operators do not sum to the identity")
 
-        self.state = apply_kraus(self.state, operators)
-        C = Config()
+        # Operators are stacked, so they are applied in a single batched product
+        stacked_operators = stack_operators(operators)
+        self.state = apply_kraus(self.state, stacked_operators)
         if C.contractions:
             self.contract()
 
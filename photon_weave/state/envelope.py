@@ -10,6 +10,7 @@ import itertools
 import logging
 import uuid
 from enum import Enum
+from functools import partial
 from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
 
 import jax
@@ -18,12 +19,21 @@ import numpy as np
 from scipy.integrate import quad
 
 from photon_weave._math.ops import (
-    kraus_identity_check,
+    cached_kraus_identity_check,
+    compute_einsum,
+    kraus_probabilities,
+    kron,
     num_quanta_matrix,
     num_quanta_vector,
+    povm_update,
+    pure_state_vector,
+    purity,
+    sample_outcome,
+    stack_operators,
 )
 from photon_weave.constants import C0, gaussian
 from photon_weave.photon_weave import Config
+from photon_weave.state.base_state import format_complex_rows
 from photon_weave.state.expansion_levels import ExpansionLevel
 from photon_weave.state.fock import Fock
 from photon_weave.state.polarization import Polarization
@@ -56,11 +66,51 @@ class TemporalProfileInstance:
         self.func = func
         self.params = params
 
-    def get_function(self, t_a: float, omega_a: float) -> Callable:
+    def get_params(self, t_a: float, omega_a: float) -> Dict[Any, Any]:
         params = self.params.copy()
         params.update({"t_a": t_a, "omega": omega_a})
+        return params
+
+    def get_function(self, t_a: float, omega_a: float) -> Callable:
+        params = self.get_params(t_a, omega_a)
+
+        return partial(self.func, **params)
+
 
-        return lambda t: self.func(t, **params)
+def _overlap_integrand(t: float, f1: Callable, f2: Callable) -> float:
+    """
+    Integrand of the temporal profile overlap, passed to `quad` together
+    with the bound profiles, so every evaluation is a single Python call
+    """
+    return np.conj(f1(t)) * f2(t)
+
+
+def _gaussian_overlap(params_a: Dict[str, Any], params_b: Dict[str, Any]) -> float:
+    r"""
+    Closed form overlap of two gaussian temporal profiles
+    (see `photon_weave.constants.gaussian`)
+
+    .. math::
+        \int f_a^*(t) f_b(t) dt = \sqrt{\frac{2\sigma_a\sigma_b}
+        {\sigma_a^2+\sigma_b^2}} e^{-\frac{\Delta^2}{2(\sigma_a^2+\sigma_b^2)}}
+
+    where :math:`\Delta` is the difference of the pulse centers (t_a + mu).
+    """
+    sigma_a = params_a.get("sigma", 1)
+    sigma_b = params_b.get("sigma", 1)
+    shift = (params_b["t_a"] + params_b.get("mu", 0)) - (
+        params_a["t_a"] + params_a.get("mu", 0)
+    )
+    variance = sigma_a**2 + sigma_b**2
+    return float(
+        np.sqrt(2 * sigma_a * sigma_b / variance) * np.exp(-(shift**2) / (2 * variance))
+    )
+
+
+# Closed form overlaps of temporal profiles, keyed on the profile function
+_ANALYTIC_OVERLAPS: Dict[
+    Callable, Callable[[Dict[str, Any], Dict[str, Any]], float]
+] = {gaussian: _gaussian_overlap}
 
 
 default_temporal_profile = TemporalProfile.Gaussian.with_params(
@@ -69,16 +119,90 @@ default_temporal_profile = TemporalProfile.Gaussian.with_params(
 )
 
 
+def _apply_operator_vector(
+    operator: jnp.ndarray,
+    state: jnp.ndarray,
+    shape: Tuple[int, int],
+    axis: int,
+    renormalize: bool,
+) -> Tuple[jnp.ndarray, jnp.ndarray]:
+    """
+    Applies the operator to the subsystem at the given axis of the envelope
+    state vector. The operator is contracted with the targeted subsystem
+    directly and the targeted subsystem is placed first in the output, so
+    the reordering, the reshapes, the contraction and the normalization are
+    fused into a single kernel.
+
+    Returns the new state vector and a flag, signaling if the state has
+    any non zero amplitude. If it has none, the unchanged state is returned.
+    """
+    subscripts = "ij,jkl->ikl" if axis == 0 else "ij,kjl->ikl"
+    ps = jnp.einsum(subscripts, operator, state.reshape((*shape, 1)))
+    nonzero = jnp.any(jnp.abs(ps) > 0)
+    if renormalize:
+        ps = ps / jnp.linalg.norm(ps)
+    return jnp.where(nonzero, ps.reshape((-1, 1)), state), nonzero
+
+
+def _apply_operator_matrix(
+    operator: jnp.ndarray,
+    state: jnp.ndarray,
+    shape: Tuple[int, int],
+    axis: int,
+    renormalize: bool,
+) -> Tuple[jnp.ndarray, jnp.ndarray]:
+    """
+    Applies the operator to the subsystem at the given axis of the envelope
+    density matrix and places the targeted subsystem first, fused into a
+    single kernel.
+
+    Returns the new density matrix and a flag, signaling if the state has
+    any non zero element. If it has none, the unchanged state is returned.
+    """
+    dims = state.shape[0]
+    subscripts = "ij,jkmn,lm->ikln" if axis == 0 else "ij,kjmn,ln->iklm"
+    ps = jnp.einsum(
+        subscripts, operator, state.reshape((*shape, *shape)), jnp.conj(operator)
+    )
+    ps = ps.reshape((dims, dims))
+    nonzero = jnp.any(jnp.abs(ps) > 0)
+    if renormalize:
+        ps = ps / jnp.linalg.norm(ps)
+    return jnp.where(nonzero, ps, state), nonzero
+
+
+# Jitted kernels, keyed on whether the buffer of the passed state is donated
+# and reused for the result. Only states created by the envelope within the
+# same call may be donated, any other state may still be held by the caller.
+_APPLY_OPERATOR_VECTOR = {
+    donate: jax.jit(
+        _apply_operator_vector,
+        static_argnums=(2, 3, 4),
+        donate_argnums=(1,) if donate else (),
+    )
+    for donate in (False, True)
+}
+_APPLY_OPERATOR_MATRIX = {
+    donate: jax.jit(
+        _apply_operator_matrix,
+        static_argnums=(2, 3, 4),
+        donate_argnums=(1,) if donate else (),
+    )
+    for donate in (False, True)
+}
+
+
 class Envelope:
     __slots__ = (
         "uid",
         "state",
         "_expansion_level",
-        "_composite_envelope_id",
+        "composite_envelope_id",
         "measured",
         "wavelength",
         "temporal_profile",
-        "__dict__",
+        "fock",
+        "polarization",
     )
 
     def __init__(
@@ -142,22 +266,7 @@ class Envelope:
             assert isinstance(self.state, jnp.ndarray)
             assert self.state.shape == (self.dimensions, 1)
             formatted_vector: Union[str, List[str]]
-            formatted_vector = ""
-            for row in self.state:
-                formatted_row = "⎢ "
-                for num in row:
-                    # Format real part
-                    formatted_row += f"{num.real:+.2f} "
-                    if num.imag >= 0:
-                        formatted_row += "+ "
-                    else:
-                        formatted_row += "- "
-
-                    formatted_row += f"{abs(num.imag):.2f}j "
-
-                formatted_row = formatted_row.strip() + " ⎥\n"
-                formatted_vector += formatted_row
-            formatted_vector = formatted_vector.strip().split("\n")
+            formatted_vector = format_complex_rows(self.state, " ")
             formatted_vector[0] = "⎡ " + formatted_vector[0][2:-1] + "⎤"
             formatted_vector[-1] = "⎣ " + formatted_vector[-1][2:-1] + "⎦"
             formatted_vector = "\n".join(formatted_vector)
@@ -167,25 +276,9 @@ class Envelope:
             assert isinstance(self.state, jnp.ndarray)
             assert self.state.shape == (self.dimensions, self.dimensions)
             formatted_matrix: Union[str, List[str]]
-            formatted_matrix = ""
-
-            for row in self.state:
-                formatted_row = "⎢ "
-                for num in row:
-                    formatted_row += f"{num.real:+.2f} "
-                    if num.imag >= 0:
-                        formatted_row += "+ "
-                    else:
-                        formatted_row += "- "
-
-                    # Format the imaginary part and add "j"
-                    formatted_row += f"{abs(num.imag):.2f}j   "
-
-                formatted_row = formatted_row.strip() + " ⎥\n"
-                formatted_matrix += formatted_row
+            formatted_matrix = format_complex_rows(self.state, "   ")
 
             # Add top and bottom brackets
-            formatted_matrix = formatted_matrix.strip().split("\n")
             formatted_matrix[0] = "⎡" + formatted_matrix[0][1:-1] + "⎤"
             formatted_matrix[-1] = "⎣" + formatted_matrix[-1][1:-1] + "⎦"
             formatted_matrix = "\n".join(formatted_matrix)
@@ -231,7 +324,7 @@ class Envelope:
             )
             assert isinstance(self.polarization, Polarization)
             assert isinstance(self.polarization.state, jnp.ndarray)
-            self.state = jnp.kron(self.fock.state, self.polarization.state)
+            self.state = kron(self.fock.state, self.polarization.state)
             self.expansion_level = ExpansionLevel.Vector
             self.fock.extract(0)
             self.polarization.extract(1)
@@ -242,7 +335,7 @@ class Envelope:
         ):
             assert isinstance(self.fock.state, jnp.ndarray)
             assert isinstance(self.polarization.state, jnp.ndarray)
-            self.state = jnp.kron(self.fock.state, self.polarization.state)
+            self.state = kron(self.fock.state, self.polarization.state)
             self.fock.extract(0)
             self.polarization.extract(1)
             self.expansion_level = ExpansionLevel.Matrix
@@ -349,12 +442,7 @@ class Envelope:
                         jnp.abs(jnp.sum(ps, axis=self.polarization.index)).flatten()
                         ** 2
                     )
-                    key = C.random_key
-                    choice = int(
-                        jax.random.choice(
-                            key, a=jnp.arange(len(probabilities)), p=probabilities
-                        )
-                    )
+                    choice = int(sample_outcome(C.random_uniform, probabilities))
                     outcomes[self.fock] = choice
 
                     # Construct post measurement state
@@ -375,12 +463,7 @@ class Envelope:
                     probabilities = (
                         jnp.abs(jnp.sum(ps, axis=self.fock.index)).flatten() ** 2
                     )
-                    key = C.random_key
-                    choice = int(
-                        jax.random.choice(
-                            key, a=jnp.arange(len(probabilities)), p=probabilities
-                        )
-                    )
+                    choice = int(sample_outcome(C.random_uniform, probabilities))
                     outcomes[self.polarization] = choice
 
                     # Construct post measurement state
@@ -405,24 +488,19 @@ class Envelope:
                     or len(states) == 0
                     or len(states) == 2
                 ):
+                    # Trace out the other space and take the diagonal at once
                     if self.fock.index == 0:
-                        subspace = jnp.einsum("bcaa->bc", ps)
+                        probabilities = jnp.einsum("bbaa->b", ps).real
                     else:
-                        subspace = jnp.einsum("aabc->bc", ps)
-                    probabilities = jnp.diag(subspace).real
+                        probabilities = jnp.einsum("aabb->b", ps).real
                     probabilities /= jnp.sum(probabilities)
-                    key = C.random_key
-                    choice = int(
-                        jax.random.choice(
-                            key, a=jnp.arange(len(probabilities)), p=probabilities
-                        )
-                    )
+                    choice = int(sample_outcome(C.random_uniform, probabilities))
                     outcomes[self.fock] = choice
 
                     # Reconstruct post measurement state
                     indices: List[Union[slice, int]] = [slice(None)] * len(ps.shape)
-                    indices[self.fock.index] = outcomes[self.fock]
-                    indices[self.fock.index + 1] = outcomes[self.fock]
+                    indices[2 * self.fock.index] = outcomes[self.fock]
+                    indices[2 * self.fock.index + 1] = outcomes[self.fock]
                     ps = ps[tuple(indices)]
 
                     post_measurement = jnp.zeros(
@@ -440,24 +518,21 @@ class Envelope:
                     or len(states) == 0
                     or len(states) == 2
                 ):
+                    # Trace out the other space and take the diagonal at once
                     if self.polarization.index == 1:
-                        subspace = jnp.einsum("aabc->bc", ps)
+                        probabilities = jnp.einsum("aabb->b", ps).real
                     else:
-                        subspace = jnp.einsum("bcaa->bc", ps)
-                    probabilities = jnp.diag(subspace).real
+                        probabilities = jnp.einsum("bbaa->b", ps).real
                     probabilities /= jnp.sum(probabilities)
-                    key = C.random_key
-                    choice = int(
-                        jax.random.choice(
-                            key, a=jnp.arange(len(probabilities)), p=probabilities
-                        )
-                    )
+                    choice = int(sample_outcome(C.random_uniform, probabilities))
                     outcomes[self.polarization] = choice
 
                     # Reconstruct post measurement state
                     indices = [slice(None)] * len(ps.shape)
-                    indices[self.polarization.index] = outcomes[self.polarization]
-                    indices[self.polarization.index + 1] = outcomes[self.polarization]
+                    indices[2 * self.polarization.index] = outcomes[self.polarization]
+                    indices[2 * self.polarization.index + 1] = outcomes[
+                        self.polarization
+                    ]
                     ps = ps[tuple(indices)]
 
                     post_measurement = jnp.zeros(
@@ -646,9 +721,6 @@ class Envelope:
         reshape_shape[self.polarization.index] = self.polarization.dimensions
 
         assert isinstance(self.state, jnp.ndarray)
-        ps = self.state.reshape([*reshape_shape, *reshape_shape]).transpose(
-            [0, 2, 1, 3]
-        )
 
         # Handle POVM measurement when both spaces are measured
         if len(states) == 2:
@@ -656,40 +728,13 @@ class Envelope:
             for op in operators:
                 assert op.shape == (self.dimensions, self.dimensions)
 
-            # Produce einsum str
-            einsum = "eacf,abcd,gbhd->egfh"
             # Compute probabilities
-            probabilities = []
-            for op in operators:
-                op = op.reshape([*reshape_shape, *reshape_shape]).transpose(
-                    [0, 2, 1, 3]
-                )
-                prob_state = (
-                    jnp.einsum(einsum, op, ps, jnp.conj(op))
-                    .transpose([0, 2, 1, 3])
-                    .reshape(self.dimensions, self.dimensions)
-                )
-                probabilities.append(jnp.trace(prob_state).real)
+            probs = kraus_probabilities(stack_operators(operators), self.state)
 
-            probs = jnp.array(probabilities) / jnp.sum(jnp.array(probabilities))
-            key = C.random_key
-
-            choice = int(
-                jax.random.choice(key, a=jnp.arange(len(operators)), p=jnp.array(probs))
-            )
+            choice = int(sample_outcome(C.random_uniform, probs))
 
             # Constructing post measurement state
-            op = (
-                operators[choice]
-                .reshape([*reshape_shape, *reshape_shape])
-                .transpose([0, 2, 1, 3])
-            )
-            self.state = (
-                jnp.einsum(einsum, op, ps, np.conj(op))
-                .transpose([0, 2, 1, 3])
-                .reshape((self.dimensions, self.dimensions))
-            )
-            self.state = self.state / jnp.trace(self.state)
+            self.state = povm_update(jnp.asarray(operators[choice]), self.state)
             if destructive:
                 self._set_measured()
                 self.fock._set_measured()
@@ -700,18 +745,17 @@ class Envelope:
             for op in operators:
                 assert op.shape == (states[0].dimensions, states[0].dimensions)
 
+            ps = self.state.reshape([*reshape_shape, *reshape_shape]).transpose(
+                [0, 2, 1, 3]
+            )
             einsum = "ea,abcd,fb->efcd"
-            einsum_trace = "abcc->ab"
 
-            # Compute probabilities
-            probabilities = []
-            for op in operators:
-                prob_state = jnp.einsum(einsum, op, ps, jnp.conj(op))
-                subspace = jnp.einsum(einsum_trace, prob_state)
-                probabilities.append(jnp.trace(subspace).real)
-            probs = jnp.array(probabilities) / jnp.sum(jnp.array(probabilities))
-            key = C.random_key
-            choice = int(jax.random.choice(key, a=jnp.arange(len(operators)), p=probs))
+            # Compute probabilities on the reduced state, the operators
+            # only act on the measured subsystem
+            probs = kraus_probabilities(
+                stack_operators(operators), jnp.einsum("abcc->ab", ps)
+            )
+            choice = int(sample_outcome(C.random_uniform, probs))
             # Constructing post measurement state
             op = operators[choice]
             self.state = (
@@ -804,7 +848,7 @@ class Envelope:
             if op.shape != (dim, dim):
                 raise ValueError("Kraus operator has incorrect dimension")
 
-        if not kraus_identity_check(operators):
+        if Config().kraus_identity_check and not cached_kraus_identity_check(operators):
             raise ValueError(
                 "Kraus operators do not sum to the identity sum K^dagg K != I"
             )
@@ -920,6 +964,17 @@ class Envelope:
                 self.fock.index,
             )
 
+    def _move_to_front(self, state: "BaseState") -> None:
+        """
+        Updates the subsystem indices after a kernel has placed the given
+        state first in the envelope state, without touching the state itself.
+        """
+        if state.index == 1:
+            self.fock.index, self.polarization.index = (
+                self.polarization.index,
+                self.fock.index,
+            )
+
     def contract(
         self, final: ExpansionLevel = ExpansionLevel.Vector, tol: float = 1e-6
     ) -> None:
@@ -937,15 +992,10 @@ class Envelope:
         # final = ExpansionLevel.Vector
         assert isinstance(self.state, jnp.ndarray)
         assert self.state.shape == (self.dimensions, self.dimensions)
-        state_squared = jnp.matmul(self.state, self.state)
-        state_trace = jnp.trace(state_squared)
+        state_trace = purity(self.state)
         if jnp.abs(state_trace - 1) < tol:
             # The state is pure
-            eigenvalues, eigenvectors = jnp.linalg.eigh(self.state)
-            # close_to_one = jnp.isclose(eigenvalues, 1.0, atol=tol)
-            pure_state_index = jnp.argmax(jnp.abs(eigenvalues - 1.0) < tol)
-            assert pure_state_index is not None, "pure_state_index should not be None"
-            self.state = eigenvectors[:, pure_state_index].reshape(-1, 1)
+            self.state = pure_state_vector(self.state)
             # Normalizing the phase
             assert self.state is not None, "self.state should not be None"
             phase = jnp.exp(-1j * jnp.angle(self.state[0]))
@@ -1008,7 +1058,7 @@ class Envelope:
             reshape_shape.append(1)
             ps = self.state.reshape(reshape_shape)
 
-            # Construct Einsum string
+            # Construct Einsum indices
             c1 = itertools.count(start=0)
             einsum_list_list: List[List[int]] = [[], []]
             einsum_to = next(c1)
@@ -1024,11 +1074,8 @@ class Envelope:
             c = next(c1)
             einsum_list_list[0].append(c)
             einsum_list_list[1].append(c)
-            einsum_list_str = [
-                "".join([chr(97 + x) for x in s]) for s in einsum_list_list
-            ]
-            einsum = f"{einsum_list_str[0]}->{einsum_list_str[1]}"
-            ps = jnp.einsum(einsum, ps)
+            einsum = tuple(tuple(e) for e in einsum_list_list)
+            ps = compute_einsum(einsum, ps)
 
             dim = int(jnp.prod(jnp.array([s.dimensions for s in states])))
             return ps.reshape(dim, 1)
@@ -1041,7 +1088,7 @@ class Envelope:
                 [0, 2, 1, 3]
             )
 
-            # Construct einsum str
+            # Construct einsum indices
             c1 = itertools.count(start=0)
             einsum_list_list = [[], []]
             einsum_to = next(c1)
@@ -1054,12 +1101,8 @@ class Envelope:
                     einsum_list_list[0].append(c)
                     if s in states:
                         einsum_list_list[1].append(c)
-            einsum_list_str = [
-                "".join([chr(97 + x) for x in s]) for s in einsum_list_list
-            ]
-            einsum = f"{einsum_list_str[0]}->{einsum_list_str[1]}"
-
-            ps = jnp.einsum(einsum, ps)
+            einsum = tuple(tuple(e) for e in einsum_list_list)
+            ps = compute_einsum(einsum, ps)
             dim = int(jnp.prod(jnp.array([s.dimensions for s in states])))
             if len(states) == 2:
                 ps = ps.transpose([0, 2, 1, 3])
@@ -1079,14 +1122,24 @@ class Envelope:
         Returns:
         float: overlap factor
         """
+        params_1 = self.temporal_profile.get_params(
+            t_a=0, omega_a=(C0 / n) / self.wavelength
+        )
+        params_2 = other.temporal_profile.get_params(
+            t_a=delay, omega_a=(C0 / n) / other.wavelength
+        )
+        # Use the closed form if both profiles have the same known shape
+        func = self.temporal_profile.func
+        if func is other.temporal_profile.func and func in _ANALYTIC_OVERLAPS:
+            return _ANALYTIC_OVERLAPS[func](params_1, params_2)
+
         f1 = self.temporal_profile.get_function(
             t_a=0, omega_a=(C0 / n) / self.wavelength
         )
         f2 = other.temporal_profile.get_function(
             t_a=delay, omega_a=(C0 / n) / other.wavelength
         )
-        integrand = lambda x: np.conj(f1(x)) * f2(x)
-        result, _ = quad(integrand, -np.inf, np.inf)
+        result, _ = quad(_overlap_integrand, -np.inf, np.inf, args=(f1, f2))
 
         return result
 
@@ -1215,7 +1268,9 @@ class Envelope:
             states[0].apply_operation(operation)
             return
 
-        self.reorder(*states)
+        # A state, which is replaced while resizing, is owned by this call
+        # and its buffer can be donated to the kernel
+        initial_state = self.state
 
         if isinstance(operation._operation_type, FockOperationType) and isinstance(
             states[0], Fock
@@ -1237,46 +1292,48 @@ class Envelope:
         assert isinstance(self.polarization.dimensions, int)
         reshape_shape[self.fock.index] = self.fock.dimensions
         reshape_shape[self.polarization.index] = self.polarization.dimensions
+        axis = states[0].index
+        assert isinstance(axis, int)
 
         if self.expansion_level == ExpansionLevel.Vector:
             assert isinstance(self.state, jnp.ndarray)
             assert self.state.shape == (self.dimensions, 1)
-            reshape_shape.append(1)
 
-            ps = self.state.reshape(reshape_shape)
-
-            # state is reordered, so the state operated on is in the first state
-            ps = jnp.einsum("ij,jkl->ikl", operation.operator, ps)
-            if not jnp.any(jnp.abs(ps) > 0):
+            ps, nonzero = _APPLY_OPERATOR_VECTOR[self.state is not initial_state](
+                operation.operator,
+                self.state,
+                tuple(reshape_shape),
+                axis,
+                bool(operation.renormalize),
+            )
+            # The state buffer might have been donated to the kernel
+            self.state = ps
+            if not nonzero:
                 raise ValueError(
                     "The state is entirely composed of zeros, is |0⟩ attempted "
                     "to be annihilated?"
                 )
-            if operation.renormalize:
-                ps = ps / jnp.linalg.norm(ps)
-            self.state = ps.reshape((-1, 1))
+            self._move_to_front(states[0])
             return
         if self.expansion_level == ExpansionLevel.Matrix:
             assert isinstance(self.state, jnp.ndarray)
             assert self.state.shape == (self.dimensions, self.dimensions)
-            ps = self.state.reshape([*reshape_shape, *reshape_shape]).transpose(
-                [0, 2, 1, 3]
-            )
 
-            ps = jnp.einsum(
-                "ij,jklm,nk->inlm", operation.operator, ps, jnp.conj(operation.operator)
+            ps, nonzero = _APPLY_OPERATOR_MATRIX[self.state is not initial_state](
+                operation.operator,
+                self.state,
+                tuple(reshape_shape),
+                axis,
+                bool(operation.renormalize),
             )
-
-            ps = ps.transpose([0, 2, 1, 3])
-            ps = ps.reshape(self.dimensions, self.dimensions)
-            if not jnp.any(jnp.abs(ps) > 0):
+            # The state buffer might have been donated to the kernel
+            self.state = ps
+            if not nonzero:
                 raise ValueError(
                     "The state is entirely composed of zeros, "
                     "is |0⟩ attempted to be annihilated?"
                 )
-            if operation.renormalize:
-                ps = ps / jnp.linalg.norm(ps)
-            self.state = ps.reshape((self.dimensions, self.dimensions))
+            self._move_to_front(states[0])
 
             C = Config()
             if C.contractions:
@@ -7,12 +7,14 @@ from __future__ import annotations
 import uuid
 from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, Union
 
-import jax
 import jax.numpy as jnp
 
 from photon_weave._math.ops import (
     num_quanta_matrix,
     num_quanta_vector,
+    pure_state_vector,
+    purity,
+    sample_outcome,
 )
 from photon_weave.operation import FockOperationType, Operation
 from photon_weave.photon_weave import Config
@@ -127,7 +129,7 @@ class Fock(BaseState):
 
         if self.expansion_level is ExpansionLevel.Label:
             assert isinstance(self.state, int)
-            state_vector = jnp.zeros(int(self.dimensions))
+            state_vector = jnp.zeros(int(self.dimensions), dtype=Config().dtype)
             state_vector = state_vector.at[self.state].set(1)
             new_state_vector = state_vector[:, jnp.newaxis]
             self.state = new_state_vector
@@ -164,16 +166,10 @@ class Fock(BaseState):
             # Check if the state is pure state
             assert isinstance(self.state, jnp.ndarray)
             assert self.state.shape == (self.dimensions, self.dimensions)
-            state_squared = jnp.matmul(self.state, self.state)
-            state_trace = jnp.trace(state_squared)
+            state_trace = purity(self.state)
             if jnp.abs(state_trace - 1) < tol:
                 # The state is pure
-                eigenvalues, eigenvectors = jnp.linalg.eigh(self.state)
-                pure_state_index = jnp.argmax(jnp.abs(eigenvalues - 1.0) < tol)
-                assert (
-                    pure_state_index is not None
-                ), "pure_state_index should not be None"
-                self.state = eigenvectors[:, pure_state_index].reshape(-1, 1)
+                self.state = pure_state_vector(self.state)
                 # Normalizing the phase
                 assert isinstance(self.state, jnp.ndarray)
                 phase = jnp.exp(-1j * jnp.angle(self.state[0]))
@@ -289,15 +285,13 @@ class Fock(BaseState):
                 probs = jnp.abs(self.state.flatten()) ** 2
                 probs = probs.ravel()
                 assert jnp.isclose(sum(probs), 1)
-                key = C.random_key
-                result = int(jax.random.choice(key, a=jnp.arange(len(probs)), p=probs))
+                result = int(sample_outcome(C.random_uniform, probs))
             case ExpansionLevel.Matrix:
                 assert isinstance(self.state, jnp.ndarray)
                 assert self.state.shape == (self.dimensions, self.dimensions)
                 probs = jnp.diag(self.state).real
                 probs = probs / jnp.sum(probs)
-                key = C.random_key
-                result = int(jax.random.choice(key, a=jnp.arange(len(probs)), p=probs))
+                result = int(sample_outcome(C.random_uniform, probs))
         self.state = result
         self.expansion_level = ExpansionLevel.Label
         outcomes: Dict[BaseState, int] = {}
@@ -9,9 +9,9 @@ import uuid
 from enum import Enum
 from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
 
-import jax
 import jax.numpy as jnp
 
+from photon_weave._math.ops import pure_state_vector, purity, sample_outcome
 from photon_weave.operation import PolarizationOperationType
 from photon_weave.photon_weave import Config
 
@@ -70,7 +70,7 @@ class Polarization(BaseState):
         If the state was measured than measured is True
     """
 
-    __slots__ = BaseState.__slots__
+    __slots__ = ()
 
     def __init__(
         self,
@@ -80,24 +80,16 @@ class Polarization(BaseState):
         # from photon_weave.state.composite_envelope import CompositeEnvelope
         # from photon_weave.state.envelope import Envelope
 
-        self.uid: uuid.UUID = uuid.uuid4()
+        self.uid = uuid.uuid4()
         logger.info("Creating polarization with uid %s", self.uid)
-        self.index: Optional[Union[int, Tuple[int, int]]] = None
+        self.index = None
         self.state: Optional[Union[jnp.ndarray, PolarizationLabel]] = polarization
         self._dimensions: int = 2
-        self.envelope: Optional["Envelope"] = envelope
+        self.envelope = envelope
         self._expansion_level: Optional[ExpansionLevel] = ExpansionLevel.Label
         self._measured: bool = False
         self._composite_envelope: Optional[CompositeEnvelope] = None
 
-    @property
-    def measured(self) -> bool:
-        return self._measured
-
-    @measured.setter
-    def measured(self, measured: bool) -> None:
-        self._measured = measured
-
     @property
     def dimensions(self) -> int:
         return self._dimensions
@@ -142,7 +134,7 @@ class Polarization(BaseState):
                 case PolarizationLabel.L:
                     # Left circular polarization = (1/sqrt(2)) * (|H⟩ - i|V⟩)
                     vector = [1 / jnp.sqrt(2), -1j / jnp.sqrt(2)]
-            self.state = jnp.array(vector)[:, jnp.newaxis]
+            self.state = jnp.array(vector, dtype=Config().dtype)[:, jnp.newaxis]
             self.expansion_level = ExpansionLevel.Vector
         elif self.expansion_level == ExpansionLevel.Vector:
             assert isinstance(self.state, jnp.ndarray)
@@ -186,16 +178,10 @@ class Polarization(BaseState):
             # Check if the state is pure state
             assert isinstance(self.state, jnp.ndarray)
             assert self.state.shape == (self.dimensions, self.dimensions)
-            state_squared = jnp.matmul(self.state, self.state)
-            state_trace = jnp.trace(state_squared)
+            state_trace = purity(self.state)
             if jnp.abs(state_trace - 1) < tol:
                 # The state is pure
-                eigenvalues, eigenvectors = jnp.linalg.eigh(self.state)
-                pure_state_index = jnp.argmax(jnp.abs(eigenvalues - 1.0) < tol)
-                assert (
-                    pure_state_index is not None
-                ), "pure_state_index should not be None"
-                self.state = eigenvectors[:, pure_state_index].reshape(-1, 1)
+                self.state = pure_state_vector(self.state)
                 # Normalizing the phase
                 assert isinstance(self.state, jnp.ndarray)
                 phase = jnp.exp(-1j * jnp.angle(self.state[0]))
@@ -306,19 +292,14 @@ class Polarization(BaseState):
             prob_1 = jnp.abs(self.state[1]) ** 2
             assert jnp.isclose(prob_0 + prob_1, 1.0)
             probs = jnp.array([prob_0[0], prob_1[0]])
-            key = C.random_key
-            outcome = jax.random.choice(key, a=jnp.array([0, 1]), p=probs.ravel())
+            outcome = sample_outcome(C.random_uniform, probs.ravel())
             results[self] = int(outcome)
         elif self.expansion_level == ExpansionLevel.Matrix:
             assert isinstance(self.state, jnp.ndarray)
             assert self.state.shape == (self.dimensions, self.dimensions)
             probabilities = jnp.diag(self.state).real
             probabilities = probabilities / jnp.sum(probabilities)
-            # Generate a random key
-            key = C.random_key
-            outcome = jax.random.choice(
-                key, a=jnp.arange(self.state.shape[0]), p=probabilities
-            )
+            outcome = sample_outcome(C.random_uniform, probabilities)
             results[self] = int(outcome)
         if results[self] == 0:
             self.state = PolarizationLabel.H
@@ -25,5 +25,5 @@ setup(
         "Topic :: Scientific/Engineering :: Physics",
     ],
     packages=find_packages(where="."),
-    install_requires=["jax", "jaxlib"],
+    install_requires=["jax", "jaxlib", "opt_einsum"],
 )
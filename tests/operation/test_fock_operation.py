@@ -1,13 +1,23 @@
 import unittest
 
+import jax
 import jax.numpy as jnp
+import numpy as np
+from jax.scipy.linalg import expm
 
 from photon_weave._math.ops import (
     annihilation_operator,
     creation_operator,
+    displacement_operator,
     number_operator,
+    phase_operator,
+    squeezing_operator,
+)
+from photon_weave.operation import (
+    FockOperationType,
+    Operation,
+    PolarizationOperationType,
 )
-from photon_weave.operation import FockOperationType, Operation
 from photon_weave.photon_weave import Config
 from photon_weave.state.composite_envelope import CompositeEnvelope
 from photon_weave.state.envelope import Envelope
@@ -102,6 +112,29 @@ class TestFockOperationCreation(unittest.TestCase):
             self.assertTrue(jnp.allclose(env.state, expected_state))
             env.expand()
 
+    def test_envelope_operation_keeps_previous_state(self) -> None:
+        """
+        Arrays, read from the envelope before an operation, must stay valid
+        """
+        C = Config()
+        C.set_contraction(False)
+        for expand in (False, True):
+            env = Envelope()
+            env.combine()
+            if expand:
+                env.expand()
+            operations = [
+                (Operation(FockOperationType.Creation), env.fock),
+                (Operation(PolarizationOperationType.X), env.polarization),
+                (Operation(FockOperationType.Creation), env.fock),
+            ]
+            for op, state in operations:
+                previous = env.state
+                previous_copy = np.array(previous)
+                env.apply_operation(op, state)
+                self.assertTrue(jnp.allclose(previous, previous_copy))
+        C.set_contraction(True)
+
     def test_creation_operation_composite_envelope_envelope(self) -> None:
         C = Config()
         C.set_contraction(True)
@@ -447,6 +480,59 @@ class TestFockOperationSqueeze(unittest.TestCase):
         )
 
 
+class TestFockOperators(unittest.TestCase):
+    def test_displacement_operator(self) -> None:
+        cutoff = 15
+        alpha = 0.7 - 0.2j
+        a = annihilation_operator(cutoff)
+        a_dag = creation_operator(cutoff)
+        expected = expm(alpha * a_dag - jnp.conj(alpha) * a)
+        op = displacement_operator(cutoff, alpha)
+        self.assertTrue(jnp.allclose(op, expected))
+        self.assertTrue(jnp.allclose(op @ jnp.conj(op).T, jnp.eye(cutoff)))
+
+    def test_squeezing_operator(self) -> None:
+        cutoff = 15
+        zeta = 0.3 + 0.1j
+        a = annihilation_operator(cutoff)
+        a_dag = creation_operator(cutoff)
+        expected = expm(0.5 * (jnp.conj(zeta) * (a @ a) - zeta * (a_dag @ a_dag)))
+        op = squeezing_operator(cutoff, zeta)
+        self.assertTrue(jnp.allclose(op, expected))
+        self.assertTrue(jnp.allclose(op @ jnp.conj(op).T, jnp.eye(cutoff)))
+
+    def test_phase_operator_traced(self) -> None:
+        cutoff = 5
+        theta = 0.3
+        op = phase_operator(cutoff, theta)
+        self.assertTrue(
+            jnp.allclose(jnp.diag(op), jnp.exp(1j * theta * jnp.arange(cutoff)))
+        )
+        self.assertTrue(
+            jnp.allclose(jax.jit(phase_operator, static_argnums=0)(cutoff, theta), op)
+        )
+        grad = jax.grad(lambda t: jnp.real(phase_operator(cutoff, t)[2, 2]))(theta)
+        self.assertTrue(jnp.isclose(grad, -2 * jnp.sin(2 * theta)))
+
+    def test_operator_dtype(self) -> None:
+        cutoff = 10
+        op = displacement_operator(cutoff, 0.5, dtype=jnp.complex64)
+        self.assertEqual(op.dtype, jnp.complex64)
+        expected = displacement_operator(cutoff, 0.5)
+        self.assertEqual(expected.dtype, jnp.complex128)
+        self.assertTrue(jnp.allclose(op, expected, atol=1e-5))
+
+        C = Config()
+        C.set_dtype(jnp.complex64)
+        try:
+            self.assertEqual(annihilation_operator(cutoff).dtype, jnp.complex64)
+            self.assertEqual(squeezing_operator(cutoff, 0.1).dtype, jnp.complex64)
+        finally:
+            C.set_dtype(jnp.complex128)
+        with self.assertRaises(ValueError):
+            C.set_dtype(jnp.float32)
+
+
 class TestExpressionOperator(unittest.TestCase):
     def test_expression_operator_fock_vector(self) -> None:
         f = Fock()
@@ -464,6 +550,20 @@ class TestExpressionOperator(unittest.TestCase):
         f.apply_operation(op)
         self.assertTrue(jnp.allclose(f.state, jnp.array([[0], [-1], [0], [0]])))
 
+    def test_expression_operator_fock_vector_power(self) -> None:
+        f = Fock()
+        f.state = 1
+        context = {
+            "n": lambda dims: number_operator(dims[0]),
+        }
+        op = Operation(
+            FockOperationType.Expresion,
+            expr=("expm", ("s_mult", -1j, jnp.pi, ("pow", "n", 3))),
+            context=context,
+        )
+        f.apply_operation(op)
+        self.assertTrue(jnp.allclose(f.state, jnp.array([[0], [-1], [0], [0]])))
+
     def test_expression_operator_fock_vector_two_scalers(self) -> None:
         f = Fock()
         # DISPLACE
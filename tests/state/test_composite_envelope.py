@@ -1292,6 +1292,23 @@ class TestCompositeMatrixTrace(unittest.TestCase):
             )
         )
 
+    def test_trace_matrix_many_states(self) -> None:
+        """
+        Tracing a product state whose einsum needs more than 52 indices
+        """
+        padding = [CustomState(1) for _ in range(28)]
+        cs1 = CustomState(2)
+        cs2 = CustomState(2)
+        cs2.state = 1
+        ce = CompositeEnvelope(cs1, *padding, cs2)
+        ce.combine(cs1, *padding, cs2)
+        cs1.expand()
+        cs1.expand()
+        self.assertEqual(ce.product_states[0].expansion_level, ExpansionLevel.Matrix)
+
+        to = ce.trace_out(*padding, cs2)
+        self.assertTrue(jnp.allclose(to, jnp.array([[0, 0], [0, 1]])))
+
 
 class TestContraction(unittest.TestCase):
     def test_contraction(self) -> None:
@@ -37,6 +37,17 @@ class TestCustomStateExpansionContraction(unittest.TestCase):
         self.assertEqual(cs.expansion_level, ExpansionLevel.Label)
 
 
+    def test_expand_complex_vector(self) -> None:
+        cs = CustomState(2)
+        cs.expand()
+        vector = jnp.array([[1], [1j]]) / jnp.sqrt(2)
+        cs.state = vector
+        cs.expand()
+        self.assertEqual(cs.expansion_level, ExpansionLevel.Matrix)
+        self.assertTrue(jnp.allclose(cs.state, vector @ jnp.conj(vector.T)))
+        self.assertTrue(jnp.isclose(jnp.trace(cs.state), 1))
+
+
 class TestCusomStateMeasurement(unittest.TestCase):
     def test_all_measurement(self):
         for i in range(9):
@@ -2,10 +2,12 @@ import unittest
 import numpy as np
 import jax.numpy as jnp
 
+from photon_weave.constants import gaussian
 from photon_weave.photon_weave import Config
 from photon_weave.state.expansion_levels import ExpansionLevel
 from photon_weave.state.envelope import (
     Envelope,
+    TemporalProfile,
     TemporalProfileInstance,
 )
 from photon_weave.state.fock import Fock
@@ -442,6 +444,29 @@ class TestEnvelopeSmallFunctions(unittest.TestCase):
         env.set_composite_envelope_id(ce.uid)
         self.assertTrue(ce is env.composite_envelope)
 
+    def test_overlap_integral(self) -> None:
+        env1 = Envelope()
+        env2 = Envelope()
+        self.assertAlmostEqual(env1.overlap_integral(env2, 0), 1)
+
+        profile_1 = TemporalProfile.Gaussian.with_params(mu=0.3, sigma=1)
+        profile_2 = TemporalProfile.Gaussian.with_params(mu=-0.2, sigma=2)
+        env1 = Envelope(temporal_profile=profile_1)
+        env2 = Envelope(temporal_profile=profile_2)
+        # Reference value computed numerically with scipy.integrate.quad
+        self.assertAlmostEqual(env1.overlap_integral(env2, 0.7), 0.8908566281224202)
+
+    def test_overlap_integral_numerical(self) -> None:
+        # Profiles without a closed form overlap are integrated numerically
+        def custom(t, t_a, omega, mu=0, sigma=1):
+            return gaussian(t, t_a, omega, mu=mu, sigma=sigma)
+
+        profile_1 = TemporalProfileInstance(custom, {"mu": 0.3, "sigma": 1})
+        profile_2 = TemporalProfileInstance(custom, {"mu": -0.2, "sigma": 2})
+        env1 = Envelope(temporal_profile=profile_1)
+        env2 = Envelope(temporal_profile=profile_2)
+        self.assertAlmostEqual(env1.overlap_integral(env2, 0.7), 0.8908566281224202)
+
 
 class TestEnvelopeMeausrement(unittest.TestCase):
     def test_measurement(self) -> None:
@@ -573,6 +598,19 @@ class TestEnvelopeMeausrement(unittest.TestCase):
         with self.assertRaises(ValueError) as context:
             env.measure()
 
+    def test_measurement_combined_matrix_reordered_vertical(self) -> None:
+        env = Envelope()
+        env.fock.state = 1
+        env.fock.dimensions = 3
+        env.polarization.state = PolarizationLabel.V
+        env.combine()
+        env.expand()
+        env.expand()
+        env.reorder(env.polarization, env.fock)
+        m = env.measure()
+        self.assertEqual(m[env.fock], 1)
+        self.assertEqual(m[env.polarization], 1)
+
     def test_measurement_destructive_partial_vector(self) -> None:
         C = Config()
         C.set_seed(1)
@@ -681,6 +719,52 @@ class TestEnvelopeMeausrement(unittest.TestCase):
         m = env.measure_POVM([op1, op2], env.fock)
         self.assertEqual(m[0], 0)
 
+    def test_POVM_measurement_combined_full_non_symmetric(self) -> None:
+        """
+        Operators, which are not symmetric, must be applied as E rho E^dagger
+        both for the probabilities and for the post measurement state
+        """
+        C = Config()
+        env = Envelope()
+        env.fock.dimensions = 2
+        env.fock.state = 1
+        env.polarization.state = PolarizationLabel.R
+        env.combine()
+        env.expand()
+        env.expand()
+        rho = np.array(env.state)
+
+        rng = np.random.default_rng(3)
+        z = rng.normal(size=(4, 4)) + 1j * rng.normal(size=(4, 4))
+        u, _ = np.linalg.qr(z)
+        operators = []
+        for k in range(4):
+            projector = np.zeros((4, 4))
+            projector[k, k] = 1
+            operators.append(jnp.array(u @ projector @ u.conj().T))
+
+        post_states = [op @ rho @ np.conj(op).T for op in operators]
+        probabilities = np.array([np.trace(ps).real for ps in post_states])
+        probabilities /= np.sum(probabilities)
+
+        for seed in range(4):
+            C.set_seed(seed)
+            u_sample = float(C.random_uniform)
+            expected = int(np.searchsorted(np.cumsum(probabilities), 1 - u_sample))
+
+            env = Envelope()
+            env.fock.dimensions = 2
+            env.fock.state = 1
+            env.polarization.state = PolarizationLabel.R
+            env.combine()
+            C.set_seed(seed)
+            m = env.measure_POVM(
+                operators, env.fock, env.polarization, destructive=False
+            )
+            self.assertEqual(m[0], expected)
+            expected_state = post_states[expected] / np.trace(post_states[expected])
+            self.assertTrue(jnp.allclose(env.state, expected_state))
+
     def test_POVM_measurement_combined_partial(self) -> None:
         C = Config()
         C.set_seed(1)
@@ -69,6 +69,14 @@ class TestFockSmallFunctions(unittest.TestCase):
                 else:
                     self.assertEqual(f"⎢{constructed_line_0}⎥", line)
 
+    def test_repr_large_dimensions(self) -> None:
+        fock = Fock()
+        fock.dimensions = 20
+        fock.state = 3
+        self.assertEqual(fock.__repr__(), "|3⟩")
+        fock.expand()
+        self.assertEqual(fock.__repr__(), "<Fock dim=20>")
+
     def test_equality(self) -> None:
         f1 = Fock()
         f2 = Fock()
@@ -1,6 +1,7 @@
 import unittest
 
 import jax.numpy as jnp
+import numpy as np
 
 from photon_weave.photon_weave import Config
 from photon_weave.state.expansion_levels import ExpansionLevel
@@ -490,6 +491,33 @@ class TestPolarizationMeasurement(unittest.TestCase):
         ]:
             self.assertIsNone(item)
 
+    def test_measure_prefetched_random(self) -> None:
+        """
+        Prefetching the random samples must not change seeded outcomes
+        """
+        C = Config()
+        C.set_seed(5)
+        expected = [Polarization(PolarizationLabel.R).measure() for _ in range(10)]
+        expected_outcomes = [list(m.values())[0] for m in expected]
+
+        C.set_seed(5)
+        C.prefetch_random(4)
+        outcomes = [
+            list(Polarization(PolarizationLabel.R).measure().values())[0]
+            for _ in range(10)
+        ]
+        self.assertEqual(outcomes, expected_outcomes)
+
+    def test_prefetch_random_empty_and_negative(self) -> None:
+        C = Config()
+        C.set_seed(5)
+        expected = C.random_uniform
+        C.set_seed(5)
+        C.prefetch_random(0)
+        self.assertEqual(C.random_uniform, expected)
+        with self.assertRaises(ValueError):
+            C.prefetch_random(-1)
+
 
 class TestPolarizationKrausOperatorApplication(unittest.TestCase):
     def test_kraus_operators(self):
@@ -515,3 +543,78 @@ class TestPolarizationKrausOperatorApplication(unittest.TestCase):
         # Correct usage of assertRaises
         with self.assertRaises(ValueError):
             pol.apply_kraus(operators)
+
+    def test_single_kraus_operator_keeps_vector(self):
+        C = Config()
+        C.set_contraction(True)
+        c, s = jnp.cos(jnp.pi / 8), jnp.sin(jnp.pi / 8)
+        operators = [jnp.array([[c, -s], [s, c]])]
+        pol = Polarization()
+        pol.apply_kraus(operators)
+        self.assertEqual(pol.state.shape, (2, 1))
+        self.assertTrue(jnp.allclose(pol.state, jnp.array([[c], [s]])))
+
+        C.set_contraction(False)
+        pol = Polarization()
+        pol.apply_kraus(operators)
+        self.assertEqual(pol.expansion_level, ExpansionLevel.Matrix)
+        self.assertTrue(
+            jnp.allclose(pol.state, jnp.array([[c * c, c * s], [s * c, s * s]]))
+        )
+        C.set_contraction(True)
+
+    def test_kraus_identity_check_skipped(self):
+        C = Config()
+        C.set_contraction(False)
+        operators = [jnp.array([[1, 0], [0, 0]])]
+        pol = Polarization()
+        with self.assertRaises(ValueError):
+            pol.apply_kraus(operators)
+        # Repeated application with the same operators hits the cached check
+        with self.assertRaises(ValueError):
+            pol.apply_kraus(operators)
+        pol.apply_kraus(operators, identity_check=False)
+        self.assertTrue(jnp.allclose(pol.state, jnp.array([[1, 0], [0, 0]])))
+        C.set_contraction(True)
+
+    def test_kraus_operators_mutated_in_place(self):
+        C = Config()
+        C.set_contraction(False)
+        try:
+            # Amplitude damping V -> H
+            operators = [np.array([[1, 0], [0, 0]]), np.array([[0, 1], [0, 0]])]
+            pol = Polarization(PolarizationLabel.V)
+            pol.apply_kraus(operators)
+            self.assertTrue(jnp.allclose(pol.state, jnp.array([[1, 0], [0, 0]])))
+
+            # The same arrays, changed in place to H -> V
+            operators[0][:] = [[0, 0], [0, 1]]
+            operators[1][:] = [[0, 0], [1, 0]]
+            pol = Polarization(PolarizationLabel.H)
+            pol.apply_kraus(operators)
+            self.assertTrue(jnp.allclose(pol.state, jnp.array([[0, 0], [0, 1]])))
+        finally:
+            C.set_contraction(True)
+
+    def test_kraus_identity_check_mutated_in_place(self):
+        operators = [np.array([[1, 0], [0, 0]]), np.array([[0, 0], [0, 1]])]
+        pol = Polarization()
+        pol.apply_kraus(operators)
+
+        # Checked operators, which are no longer complete, must be rejected
+        operators[1][:] = [[0, 0], [0, 0]]
+        pol = Polarization()
+        with self.assertRaises(ValueError):
+            pol.apply_kraus(operators)
+
+    def test_kraus_identity_check_disabled_globally(self):
+        C = Config()
+        C.set_contraction(False)
+        C.set_kraus_identity_check(False)
+        try:
+            pol = Polarization()
+            pol.apply_kraus([jnp.array([[0, 0], [0, 1]])])
+            self.assertTrue(jnp.allclose(pol.state, jnp.zeros((2, 2))))
+        finally:
+            C.set_kraus_identity_check(True)
+            C.set_contraction(True)